@@ -18,10 +18,24 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Add collection_progress column with default value 0
-    op.add_column('audiences', sa.Column('collection_progress', sa.Float(), nullable=False, server_default='0'))
+    # Add collection_progress column with default value 0; the column is also
+    # added by a sibling revision on another branch, so skip it if present
+    op.execute(
+        "ALTER TABLE audiences "
+        "ADD COLUMN IF NOT EXISTS collection_progress double precision NOT NULL DEFAULT 0"
+    )
+    # Index only audiences with a collection underway (progress runs from 0 to 100)
+    op.create_index(
+        'ix_audiences_collection_in_progress',
+        'audiences',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('collection_progress > 0 AND collection_progress < 100'),
+        if_not_exists=True
+    )
 
 
 def downgrade() -> None:
     # Remove collection_progress column
-    op.drop_column('audiences', 'collection_progress')
+    op.drop_index('ix_audiences_collection_in_progress', table_name='audiences', if_exists=True)
+    op.execute("ALTER TABLE audiences DROP COLUMN IF EXISTS collection_progress")
@@ -1,5 +1,8 @@
 """add_missing_subreddit_fields
 
+No-op: subreddits.relevance_score is added by add_rel_score; this revision
+is kept only so existing databases stamped with it still resolve.
+
 Revision ID: 3df60bc2636f
 Revises: d3b86475982a
 Create Date: 2025-03-12 20:26:00.000000
@@ -18,10 +21,10 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Add missing fields to subreddits table
-    op.add_column('subreddits', sa.Column('relevance_score', sa.Float(), nullable=True, server_default='0.0'))
+    # relevance_score is added by add_rel_score
+    pass
 
 
 def downgrade() -> None:
-    # Remove added columns
-    op.drop_column('subreddits', 'relevance_score')
+    # relevance_score is dropped by add_rel_score
+    pass
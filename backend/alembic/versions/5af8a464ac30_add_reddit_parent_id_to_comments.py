@@ -20,10 +20,25 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     # Add reddit_parent_id column
     op.add_column('comments', sa.Column('reddit_parent_id', sa.String(length=50), nullable=True))
-    op.create_index(op.f('ix_comments_reddit_parent_id'), 'comments', ['reddit_parent_id'], unique=False)
+    # Build the index concurrently so writes to comments are not blocked
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_comments_reddit_parent_id'),
+            'comments',
+            ['reddit_parent_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
 
 
 def downgrade() -> None:
     # Remove reddit_parent_id column and its index
-    op.drop_index(op.f('ix_comments_reddit_parent_id'), table_name='comments')
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_comments_reddit_parent_id'),
+            table_name='comments',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
     op.drop_column('comments', 'reddit_parent_id')
@@ -19,12 +19,32 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     # Update all datetime columns to use timestamptz
-    op.alter_column('redditpost', 'created_at',
-                    type_=sa.DateTime(timezone=True),
-                    postgresql_using='created_at AT TIME ZONE \'UTC\'')
-    op.alter_column('redditpost', 'collected_at',
-                    type_=sa.DateTime(timezone=True),
-                    postgresql_using='collected_at AT TIME ZONE \'UTC\'')
+    # redditpost is large, so convert it expand/contract style instead of an
+    # in-place ALTER COLUMN TYPE that rewrites the table under an exclusive lock.
+    # This revision is the expand phase; redditpost_timestamptz_backfill and
+    # redditpost_timestamptz_contract follow, so the app can be deployed
+    # against the dual-written columns in between
+
+    # Expand: add timestamptz shadow columns kept in sync by a trigger
+    op.execute(
+        "ALTER TABLE redditpost "
+        "ADD COLUMN created_at_tz timestamp with time zone, "
+        "ADD COLUMN collected_at_tz timestamp with time zone"
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION redditpost_sync_timestamptz() RETURNS trigger AS $$
+        BEGIN
+            NEW.created_at_tz := NEW.created_at AT TIME ZONE 'UTC';
+            NEW.collected_at_tz := NEW.collected_at AT TIME ZONE 'UTC';
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER redditpost_sync_timestamptz
+        BEFORE INSERT OR UPDATE ON redditpost
+        FOR EACH ROW EXECUTE FUNCTION redditpost_sync_timestamptz()
+    """)
     
     # For comment.created_utc, we keep it as double precision since it's a Unix timestamp
     
@@ -38,13 +58,14 @@ def upgrade() -> None:
 
 
 def downgrade() -> None:
-    # Convert back to timezone-naive datetime
-    op.alter_column('redditpost', 'created_at',
-                    type_=sa.DateTime(timezone=False),
-                    postgresql_using='created_at AT TIME ZONE \'UTC\'')
-    op.alter_column('redditpost', 'collected_at',
-                    type_=sa.DateTime(timezone=False),
-                    postgresql_using='collected_at AT TIME ZONE \'UTC\'')
+    # Remove the sync trigger and the shadow columns
+    op.execute("DROP TRIGGER IF EXISTS redditpost_sync_timestamptz ON redditpost")
+    op.execute("DROP FUNCTION IF EXISTS redditpost_sync_timestamptz()")
+    op.execute(
+        "ALTER TABLE redditpost "
+        "DROP COLUMN IF EXISTS created_at_tz, "
+        "DROP COLUMN IF EXISTS collected_at_tz"
+    )
     
     # For comment.created_utc, no change needed since it's a Unix timestamp
     
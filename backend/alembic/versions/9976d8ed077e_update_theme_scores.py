@@ -18,18 +18,56 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+# NULL theme_scores rows defaulted per committed batch
+BACKFILL_BATCH_SIZE = 10000
+
+
 def upgrade() -> None:
     # Get connection
     connection = op.get_bind()
 
     # Update theme_scores in postanalysis
-    connection.execute(sa.text("UPDATE postanalysis SET theme_scores = '{}' WHERE theme_scores IS NULL"))
-    
-    # Make theme_scores not null with default
+    # Default new rows first (metadata-only), then find the remaining NULL rows
+    # through a partial index instead of a full table scan
     op.alter_column('postanalysis', 'theme_scores',
                 existing_type=postgresql.JSONB(),
-                nullable=False,
-                server_default='{}')
+                server_default=sa.text("'{}'::jsonb"))
+
+    # Everything below runs outside the migration transaction, so each
+    # statement commits on its own and no lock outlives its statement
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_postanalysis_theme_scores_null "
+            "ON postanalysis (id) WHERE theme_scores IS NULL"
+        )
+        while True:
+            result = connection.execute(
+                sa.text("""
+                    UPDATE postanalysis SET theme_scores = '{}'
+                    WHERE id IN (
+                        SELECT id FROM postanalysis
+                        WHERE theme_scores IS NULL
+                        LIMIT :batch_size
+                    )
+                """),
+                {"batch_size": BACKFILL_BATCH_SIZE}
+            )
+            if not result.rowcount:
+                break
+
+        # Enforce NOT NULL with a CHECK added as NOT VALID, which commits before
+        # the validation scan, so the scan only holds SHARE UPDATE EXCLUSIVE;
+        # SET NOT NULL then reuses the check instead of scanning again
+        op.execute(
+            "ALTER TABLE postanalysis ADD CONSTRAINT theme_scores_not_null "
+            "CHECK (theme_scores IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE postanalysis VALIDATE CONSTRAINT theme_scores_not_null")
+        op.alter_column('postanalysis', 'theme_scores',
+                    existing_type=postgresql.JSONB(),
+                    nullable=False)
+        op.execute("ALTER TABLE postanalysis DROP CONSTRAINT theme_scores_not_null")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_postanalysis_theme_scores_null")
 
 
 def downgrade() -> None:
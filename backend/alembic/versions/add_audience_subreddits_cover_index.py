@@ -0,0 +1,42 @@
+"""add covering index on audience_subreddits
+
+Revision ID: add_audience_subreddits_cover_index
+Revises: add_last_collection_time
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_audience_subreddits_cover_index'
+down_revision: Union[str, None] = 'add_last_collection_time'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cover the "subreddits for an audience" lookup so it can be an index-only scan
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_audience_subreddits_audience_cover',
+            'audience_subreddits',
+            ['audience_id', 'added_at'],
+            unique=False,
+            postgresql_include=['subreddit_name'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    # Remove covering index
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_audience_subreddits_audience_cover',
+            table_name='audience_subreddits',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,42 @@
+"""add subreddit-first index on audience_subreddits
+
+Revision ID: add_audience_subreddits_subreddit_index
+Revises: add_audience_subreddits_cover_index
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_audience_subreddits_subreddit_index'
+down_revision: Union[str, None] = 'add_audience_subreddits_cover_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The primary key leads with audience_id; lookups by subreddit ("is this
+    # subreddit used by another audience?") need subreddit_name first
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_audience_subreddits_subreddit_audience',
+            'audience_subreddits',
+            ['subreddit_name', 'audience_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    # Remove subreddit-first index
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_audience_subreddits_subreddit_audience',
+            table_name='audience_subreddits',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
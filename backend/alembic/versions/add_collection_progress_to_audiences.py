@@ -18,10 +18,14 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Add collection_progress column with default value of 0
-    op.add_column('audiences', sa.Column('collection_progress', sa.Float(), nullable=True, server_default='0'))
+    # Add collection_progress column with default value 0; the column is also
+    # added by a sibling revision on another branch, so skip it if present
+    op.execute(
+        "ALTER TABLE audiences "
+        "ADD COLUMN IF NOT EXISTS collection_progress double precision NOT NULL DEFAULT 0"
+    )
 
 
 def downgrade() -> None:
     # Remove collection_progress column
-    op.drop_column('audiences', 'collection_progress') 
\ No newline at end of file
+    op.execute("ALTER TABLE audiences DROP COLUMN IF EXISTS collection_progress") 
\ No newline at end of file
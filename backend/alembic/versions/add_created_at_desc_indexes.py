@@ -0,0 +1,50 @@
+"""add descending created_at indexes
+
+Revision ID: add_created_at_desc_indexes
+Revises: add_audience_subreddits_subreddit_index
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_created_at_desc_indexes'
+down_revision: Union[str, None] = 'add_audience_subreddits_subreddit_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column) for "most recent first" reads
+DESC_INDEXES = (
+    ('ix_redditpost_created_at_desc', 'redditpost', 'created_at'),
+    ('ix_redditpost_collected_at_desc', 'redditpost', 'collected_at'),
+    ('ix_comments_created_at_desc', 'comments', 'created_at'),
+)
+
+
+def upgrade() -> None:
+    # Let ORDER BY ... DESC LIMIT n read the index instead of sorting the table
+    with op.get_context().autocommit_block():
+        for name, table, column in DESC_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(f'{column} DESC')],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    # Remove descending indexes
+    with op.get_context().autocommit_block():
+        for name, table, _ in DESC_INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
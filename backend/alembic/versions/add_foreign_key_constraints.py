@@ -17,35 +17,27 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+# (constraint name, table, column, referenced table, referenced column)
+FOREIGN_KEYS = (
+    ('fk_redditpost_subreddit', 'redditpost', 'subreddit_name', 'subreddits', 'name'),
+    ('fk_audience_subreddits_audience', 'audience_subreddits', 'audience_id', 'audiences', 'id'),
+    ('fk_audience_subreddits_subreddit', 'audience_subreddits', 'subreddit_name', 'subreddits', 'name'),
+)
+
+
 def upgrade() -> None:
-    # Add foreign key constraint to redditpost
-    op.create_foreign_key(
-        'fk_redditpost_subreddit',
-        'redditpost',
-        'subreddits',
-        ['subreddit_name'],
-        ['name'],
-        ondelete='CASCADE'
-    )
-
-    # Add foreign key constraints to audience_subreddits
-    op.create_foreign_key(
-        'fk_audience_subreddits_audience',
-        'audience_subreddits',
-        'audiences',
-        ['audience_id'],
-        ['id'],
-        ondelete='CASCADE'
-    )
-
-    op.create_foreign_key(
-        'fk_audience_subreddits_subreddit',
-        'audience_subreddits',
-        'subreddits',
-        ['subreddit_name'],
-        ['name'],
-        ondelete='CASCADE'
-    )
+    # Add the constraints as NOT VALID first: metadata-only, enforced for new rows
+    for name, table, column, ref_table, ref_column in FOREIGN_KEYS:
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+            f"FOREIGN KEY ({column}) REFERENCES {ref_table} ({ref_column}) "
+            f"ON DELETE CASCADE NOT VALID"
+        )
+
+    # Then check existing rows after the ADDs commit, which only takes SHARE UPDATE EXCLUSIVE
+    with op.get_context().autocommit_block():
+        for name, table, _, _, _ in FOREIGN_KEYS:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
 
 
 def downgrade() -> None:
@@ -19,8 +19,17 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     # Add is_collecting column with default value False
     op.add_column('audiences', sa.Column('is_collecting', sa.Boolean(), nullable=False, server_default='false'))
+    # Only in-progress audiences are looked up by this flag, so index just those rows
+    op.create_index(
+        'ix_audiences_is_collecting_active',
+        'audiences',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('is_collecting')
+    )
 
 
 def downgrade() -> None:
     # Remove is_collecting column
+    op.drop_index('ix_audiences_is_collecting_active', table_name='audiences')
     op.drop_column('audiences', 'is_collecting')
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""add now() server defaults for post, subreddit and theme timestamps
+
+Revision ID: add_model_timestamp_server_defaults
+Revises: subreddit_name_c_collation
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_model_timestamp_server_defaults'
+down_revision: Union[str, None] = 'subreddit_name_c_collation'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) stamped by the database on insert instead of by the app
+TIMESTAMP_DEFAULTS = (
+    ('redditpost', 'created_at'),
+    ('redditpost', 'collected_at'),
+    ('subreddits', 'created_at'),
+    ('subreddits', 'updated_at'),
+    ('subreddits', 'last_updated'),
+    ('theme', 'created_at'),
+    ('theme', 'updated_at'),
+    ('themepost', 'added_at'),
+    ('themequestion', 'created_at'),
+    ('themequestion', 'updated_at'),
+)
+
+
+def _existing_columns() -> set:
+    """(table, column) pairs from TIMESTAMP_DEFAULTS present in this database."""
+    # The theme tables and subreddits.last_updated come from init_db's
+    # create_all rather than from a migration, so they may be missing
+    rows = op.get_bind().execute(sa.text(
+        "SELECT table_name, column_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema()"
+    ))
+    return set(TIMESTAMP_DEFAULTS) & {(table, column) for table, column in rows}
+
+
+def upgrade() -> None:
+    # Set now() defaults; metadata-only, existing rows are untouched
+    existing = _existing_columns()
+    for table, column in TIMESTAMP_DEFAULTS:
+        if (table, column) in existing:
+            op.alter_column(table, column, server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    # Remove now() defaults
+    existing = _existing_columns()
+    for table, column in TIMESTAMP_DEFAULTS:
+        if (table, column) in existing:
+            op.alter_column(table, column, server_default=None)
@@ -0,0 +1,52 @@
+"""add GIN indexes on post analysis arrays
+
+Revision ID: add_post_analysis_gin_indexes
+Revises: drop_post_analysis_string_columns
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_post_analysis_gin_indexes'
+down_revision: Union[str, None] = 'drop_post_analysis_string_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+# The indexed array columns come from update_post_analysis_arrays; it is
+# merged in by drop_post_analysis_string_columns, and named here too so the
+# requirement holds even if that merge point moves
+depends_on: Union[str, Sequence[str], None] = 'update_post_analysis_arrays'
+
+# (index name, array column) on postanalysis
+GIN_INDEXES = (
+    ('ix_postanalysis_themes_gin', 'matching_themes_array'),
+    ('ix_postanalysis_keywords_gin', 'keywords_array'),
+)
+
+
+def upgrade() -> None:
+    # Serve @> / && containment filters from an index instead of a seq scan
+    with op.get_context().autocommit_block():
+        for name, column in GIN_INDEXES:
+            op.create_index(
+                name,
+                'postanalysis',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    # Remove GIN indexes
+    with op.get_context().autocommit_block():
+        for name, _ in GIN_INDEXES:
+            op.drop_index(
+                name,
+                table_name='postanalysis',
+                postgresql_concurrently=True,
+                if_exists=True
+            )
@@ -26,9 +26,9 @@ def upgrade() -> None:
         sa.Column('keywords', sa.String(), nullable=False, server_default=''),
         sa.Column('analyzed_at', sa.DateTime(), nullable=False),
         sa.ForeignKeyConstraint(['post_id'], ['redditposts.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id'),
+        sa.Index('ix_post_analysis_post_id', 'post_id', unique=True)
     )
-    op.create_index(op.f('ix_post_analysis_post_id'), 'post_analysis', ['post_id'], unique=True)
 
 def downgrade() -> None:
     op.drop_index(op.f('ix_post_analysis_post_id'), table_name='post_analysis')
@@ -0,0 +1,37 @@
+"""add server defaults for redditpost metric columns
+
+Revision ID: add_redditpost_metric_server_defaults
+Revises: add_redditpost_sub_created_index
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_redditpost_metric_server_defaults'
+down_revision: Union[str, None] = 'add_redditpost_sub_created_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (column, default) filled in by the database when an INSERT omits them;
+# upvote_ratio and engagement_score already had these from f184c96f5c04
+METRIC_DEFAULTS = (
+    ('score', '0'),
+    ('num_comments', '0'),
+    ('upvote_ratio', '1.0'),
+    ('engagement_score', '0.0'),
+)
+
+
+def upgrade() -> None:
+    # Set defaults; metadata-only, existing rows are untouched
+    for column, default in METRIC_DEFAULTS:
+        op.alter_column('redditpost', column, server_default=default)
+
+
+def downgrade() -> None:
+    # Only score and num_comments were added here
+    for column in ('score', 'num_comments'):
+        op.alter_column('redditpost', column, server_default=None)
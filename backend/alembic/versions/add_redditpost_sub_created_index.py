@@ -0,0 +1,42 @@
+"""add covering subreddit/created_at index on redditpost
+
+Revision ID: add_redditpost_sub_created_index
+Revises: add_model_timestamp_server_defaults
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_redditpost_sub_created_index'
+down_revision: Union[str, None] = 'add_model_timestamp_server_defaults'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serve per-subreddit newest-first listings with index-only scans
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_redditpost_sub_created',
+            'redditpost',
+            ['subreddit_name', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_include=['score', 'num_comments', 'title'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    # Remove covering index
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_redditpost_sub_created',
+            table_name='redditpost',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
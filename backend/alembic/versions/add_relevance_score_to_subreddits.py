@@ -1,5 +1,8 @@
 """add relevance_score to subreddits
 
+This is the revision that owns subreddits.relevance_score; 3df60bc2636f
+on the other branch is kept as a no-op for history continuity.
+
 Revision ID: add_rel_score
 Revises: ef3d746cdbea
 Create Date: 2025-03-12 14:45:00.000000
@@ -19,9 +22,9 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     # Add relevance_score column with default value of 0
-    op.add_column('subreddits', sa.Column('relevance_score', sa.Float(), nullable=True, server_default='0'))
+    op.execute("ALTER TABLE subreddits ADD COLUMN IF NOT EXISTS relevance_score double precision DEFAULT 0")
 
 
 def downgrade() -> None:
     # Remove relevance_score column
-    op.drop_column('subreddits', 'relevance_score') 
\ No newline at end of file
+    op.execute("ALTER TABLE subreddits DROP COLUMN IF EXISTS relevance_score") 
\ No newline at end of file
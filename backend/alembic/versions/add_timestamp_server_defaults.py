@@ -0,0 +1,37 @@
+"""add server defaults for insert timestamps
+
+Revision ID: add_timestamp_server_defaults
+Revises: narrow_comment_columns
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_timestamp_server_defaults'
+down_revision: Union[str, None] = 'narrow_comment_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) stamped by the database on insert instead of by the app
+TIMESTAMP_DEFAULTS = (
+    ('audiences', 'created_at'),
+    ('audiences', 'updated_at'),
+    ('audience_subreddits', 'added_at'),
+    ('comments', 'collected_at'),
+)
+
+
+def upgrade() -> None:
+    # Set now() defaults; metadata-only, existing rows are untouched
+    for table, column in TIMESTAMP_DEFAULTS:
+        op.alter_column(table, column, server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    # Remove now() defaults
+    for table, column in TIMESTAMP_DEFAULTS:
+        op.alter_column(table, column, server_default=None)
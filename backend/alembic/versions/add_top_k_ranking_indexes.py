@@ -0,0 +1,49 @@
+"""add ranking indexes for top-k theme posts and comments
+
+Revision ID: add_top_k_ranking_indexes
+Revises: fold_post_analysis_into_redditpost
+Create Date: 2026-10-16 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_top_k_ranking_indexes'
+down_revision: Union[str, None] = 'fold_post_analysis_into_redditpost'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, group column, ranking column)
+RANKING_INDEXES = (
+    ('ix_themepost_theme_relevance', 'themepost', 'theme_id', 'relevance_score'),
+    ('ix_comments_post_engagement', 'comments', 'post_id', 'engagement_score'),
+)
+
+
+def upgrade() -> None:
+    # Let per-group ORDER BY ... DESC NULLS LAST LIMIT n read the index in order
+    with op.get_context().autocommit_block():
+        for name, table, group_column, ranking_column in RANKING_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [group_column, sa.text(f'{ranking_column} DESC NULLS LAST')],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    # Remove ranking indexes
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in RANKING_INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
@@ -17,6 +17,9 @@ depends_on = None
 
 
 def upgrade() -> None:
+    # Serialize with other deploys running this swap; released on commit
+    op.execute("SELECT pg_advisory_xact_lock(hashtext('comment_schema_update'))")
+    
     # Drop old comment table if it exists
     op.execute('DROP TABLE IF EXISTS comment CASCADE')
     
@@ -34,11 +37,11 @@ def upgrade() -> None:
         sa.Column('author', sa.String(), nullable=False),
         sa.Column('score', sa.Integer(), nullable=False, server_default='0'),
         sa.Column('depth', sa.Integer(), nullable=False, server_default='0'),
-        sa.Column('path', postgresql.ARRAY(sa.Integer()), nullable=True, server_default='{}'),
+        sa.Column('path', postgresql.ARRAY(sa.Integer()), nullable=True, server_default=sa.text("'{}'::integer[]")),
         sa.Column('is_submitter', sa.Boolean(), nullable=False, server_default='false'),
         sa.Column('distinguished', sa.String(), nullable=True),
         sa.Column('stickied', sa.Boolean(), nullable=False, server_default='false'),
-        sa.Column('awards', postgresql.JSONB(), nullable=True, server_default='{}'),
+        sa.Column('awards', postgresql.JSONB(), nullable=True, server_default=sa.text("'{}'::jsonb")),
         sa.Column('edited', sa.Boolean(), nullable=False, server_default='false'),
         sa.Column('engagement_score', sa.Float(), nullable=False, server_default='0'),
         sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
@@ -46,9 +49,11 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['post_id'], ['redditpost.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['parent_id'], ['comments.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('reddit_id')
+        sa.Index('ix_comments_reddit_id', 'reddit_id', unique=True),
+        # reddit_id (unique) leads so lookups resolving a comment to its post
+        # descend the most selective column first and can skip the heap
+        sa.Index('ix_comments_reddit_id_post', 'reddit_id', 'post_id')
     )
-    op.create_index(op.f('ix_comments_reddit_id'), 'comments', ['reddit_id'], unique=True)
 
 
 def downgrade() -> None:
@@ -0,0 +1,86 @@
+"""drop string copies of post analysis array/jsonb columns
+
+Revision ID: drop_post_analysis_string_columns
+Revises: add_timestamp_server_defaults, update_post_analysis_arrays, 31c16f6e91de, e021a134ba18
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'drop_post_analysis_string_columns'
+# Also merges every head that creates or alters postanalysis, so the array
+# and jsonb columns exist before they are backfilled and read
+down_revision: Union[str, Sequence[str], None] = (
+    'add_timestamp_server_defaults',
+    'update_post_analysis_arrays',
+    '31c16f6e91de',
+    'e021a134ba18',
+)
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows backfilled per committed batch
+BACKFILL_BATCH_SIZE = 10000
+
+
+def _split_list(column: str) -> str:
+    """SQL splitting a comma separated string column into a trimmed text[]."""
+    return (
+        f"ARRAY(SELECT btrim(item) FROM unnest(string_to_array({column}, ',')) AS item "
+        f"WHERE btrim(item) <> '')"
+    )
+
+
+def _backfill(statement: str) -> None:
+    """Run an id-ranged UPDATE over postanalysis, committing each batch."""
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        max_id = connection.execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM postanalysis")).scalar()
+        for low in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text(statement),
+                {"low": low, "high": low + BACKFILL_BATCH_SIZE - 1}
+            )
+
+
+def upgrade() -> None:
+    # Copy rows only ever written in string form into the native columns
+    _backfill(f"""
+        UPDATE postanalysis
+        SET matching_themes_array = COALESCE(matching_themes_array, {_split_list('matching_themes')}),
+            keywords_array = COALESCE(keywords_array, {_split_list('keywords')}),
+            theme_scores_jsonb = COALESCE(theme_scores_jsonb, NULLIF(theme_scores::text, '')::jsonb, '{{}}'::jsonb)
+        WHERE id BETWEEN :low AND :high
+          AND (matching_themes_array IS NULL OR keywords_array IS NULL OR theme_scores_jsonb IS NULL)
+    """)
+
+    # Drop the string copies; metadata-only, the table is not rewritten
+    op.execute(
+        "ALTER TABLE postanalysis "
+        "DROP COLUMN IF EXISTS matching_themes, "
+        "DROP COLUMN IF EXISTS keywords, "
+        "DROP COLUMN IF EXISTS theme_scores"
+    )
+
+
+def downgrade() -> None:
+    # Re-add the string columns
+    op.execute(
+        "ALTER TABLE postanalysis "
+        "ADD COLUMN IF NOT EXISTS matching_themes varchar NOT NULL DEFAULT '', "
+        "ADD COLUMN IF NOT EXISTS keywords varchar NOT NULL DEFAULT '', "
+        "ADD COLUMN IF NOT EXISTS theme_scores varchar NOT NULL DEFAULT '{}'"
+    )
+
+    # Fill them back in from the native columns
+    _backfill("""
+        UPDATE postanalysis
+        SET matching_themes = COALESCE(array_to_string(matching_themes_array, ','), ''),
+            keywords = COALESCE(array_to_string(keywords_array, ','), ''),
+            theme_scores = COALESCE(theme_scores_jsonb::text, '{}')
+        WHERE id BETWEEN :low AND :high
+    """)
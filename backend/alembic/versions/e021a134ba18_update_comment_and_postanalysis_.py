@@ -1,7 +1,7 @@
 """update_comment_and_postanalysis_constraints_v2
 
 Revision ID: e021a134ba18
-Revises: 0f7557a2ba0f
+Revises: 9976d8ed077e
 Create Date: 2024-03-16 16:35:54.112
 
 """
@@ -9,75 +9,77 @@ from typing import Sequence, Union
 
 import sqlalchemy as sa
 from alembic import op
-from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision: str = 'e021a134ba18'
-down_revision: Union[str, None] = '0f7557a2ba0f'
+# Follows 9976d8ed077e, which owns the postanalysis.theme_scores change
+down_revision: Union[str, None] = '9976d8ed077e'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Orphaned comments deleted per committed batch
+ORPHAN_DELETE_BATCH_SIZE = 5000
+
 
 def upgrade() -> None:
     # Get connection
     connection = op.get_bind()
 
-    # Update theme_scores in postanalysis
-    connection.execute(sa.text("UPDATE postanalysis SET theme_scores = '{}' WHERE theme_scores IS NULL"))
-    op.alter_column('postanalysis', 'theme_scores',
-                existing_type=postgresql.JSONB(),
-                nullable=False,
-                server_default='{}')
-
     # Update comment table - path
     connection.execute(sa.text("UPDATE comment SET path = '{}' WHERE path IS NULL"))
-    op.alter_column('comment', 'path',
-                existing_type=postgresql.ARRAY(sa.INTEGER()),
-                nullable=False,
-                server_default='{}')
 
     # Clean up invalid references in comment table
+    # Run the anti-join once into a temp table, then delete in committed batches
     connection.execute(sa.text("""
-        DELETE FROM comment 
-        WHERE post_id IS NULL 
-        OR post_id NOT IN (SELECT reddit_id FROM redditpost)
+        CREATE TEMP TABLE orphan_comment_ids AS
+        SELECT c.id
+        FROM comment c
+        LEFT JOIN redditpost r ON c.post_id = r.reddit_id
+        WHERE c.post_id IS NULL OR r.reddit_id IS NULL
     """))
+    connection.execute(sa.text("CREATE INDEX ON orphan_comment_ids (id)"))
 
-    # Make post_id not null
-    op.alter_column('comment', 'post_id',
-                existing_type=sa.VARCHAR(),
-                nullable=False)
+    with op.get_context().autocommit_block():
+        last_id = 0
+        while True:
+            orphan_ids = connection.execute(
+                sa.text("""
+                    SELECT id FROM orphan_comment_ids
+                    WHERE id > :last_id
+                    ORDER BY id
+                    LIMIT :batch_size
+                """),
+                {"last_id": last_id, "batch_size": ORPHAN_DELETE_BATCH_SIZE}
+            ).scalars().all()
+            if not orphan_ids:
+                break
 
-    # Drop existing foreign key if it exists
-    try:
-        op.drop_constraint('comment_post_id_fkey', 'comment', type_='foreignkey')
-    except:
-        pass
+            connection.execute(
+                sa.text("DELETE FROM comment WHERE id = ANY(:ids)"),
+                {"ids": list(orphan_ids)}
+            )
+            last_id = orphan_ids[-1]
 
-    # Create new foreign key with cascade delete
-    op.create_foreign_key(
-        'comment_post_id_fkey',
-        'comment',
-        'redditpost',
-        ['post_id'],
-        ['reddit_id'],
-        ondelete='CASCADE'
+        connection.execute(sa.text("DROP TABLE orphan_comment_ids"))
+
+    # Apply the comment column and foreign key changes in a single ALTER TABLE
+    # so the table is locked and checked once rather than once per change
+    op.execute(
+        "ALTER TABLE comment "
+        "ALTER COLUMN path SET DEFAULT '{}'::integer[], "
+        "ALTER COLUMN path SET NOT NULL, "
+        "ALTER COLUMN post_id SET NOT NULL, "
+        "DROP CONSTRAINT IF EXISTS comment_post_id_fkey, "
+        "ADD CONSTRAINT comment_post_id_fkey FOREIGN KEY (post_id) "
+        "REFERENCES redditpost (reddit_id) ON DELETE CASCADE"
     )
 
 
 def downgrade() -> None:
-    # Remove foreign key constraint
-    op.drop_constraint('comment_post_id_fkey', 'comment', type_='foreignkey')
-    
-    # Revert comment table changes
-    op.alter_column('comment', 'post_id',
-                existing_type=sa.VARCHAR(),
-                nullable=True)
-    op.alter_column('comment', 'path',
-                existing_type=postgresql.ARRAY(sa.INTEGER()),
-                nullable=True)
-    
-    # Revert postanalysis changes
-    op.alter_column('postanalysis', 'theme_scores',
-                existing_type=postgresql.JSONB(),
-                nullable=True)
+    # Remove foreign key constraint and revert comment table changes
+    op.execute(
+        "ALTER TABLE comment "
+        "DROP CONSTRAINT comment_post_id_fkey, "
+        "ALTER COLUMN post_id DROP NOT NULL, "
+        "ALTER COLUMN path DROP NOT NULL"
+    )
@@ -28,7 +28,7 @@ def upgrade() -> None:
     op.add_column('redditpost', sa.Column('stickied', sa.Boolean(), nullable=True, server_default='false'))
     op.add_column('redditpost', sa.Column('collection_source', sa.String(length=20), nullable=True))
     op.add_column('redditpost', sa.Column('engagement_score', sa.Float(), nullable=True, server_default='0.0'))
-    op.add_column('redditpost', sa.Column('awards', postgresql.JSONB(), nullable=True, server_default='{}'))
+    op.add_column('redditpost', sa.Column('awards', postgresql.JSONB(), nullable=True, server_default=sa.text("'{}'::jsonb")))
     
     # Create comments table
     op.create_table('comments',
@@ -41,11 +41,11 @@ def upgrade() -> None:
         sa.Column('author', sa.String(length=100), nullable=False),
         sa.Column('score', sa.Integer(), nullable=False, server_default='0'),
         sa.Column('depth', sa.Integer(), nullable=False, server_default='0'),
-        sa.Column('path', sa.ARRAY(sa.Integer()), nullable=True, server_default='{}'),
+        sa.Column('path', sa.ARRAY(sa.Integer()), nullable=True, server_default=sa.text("'{}'::integer[]")),
         sa.Column('is_submitter', sa.Boolean(), nullable=False, server_default='false'),
         sa.Column('distinguished', sa.String(length=50), nullable=True),
         sa.Column('stickied', sa.Boolean(), nullable=False, server_default='false'),
-        sa.Column('awards', postgresql.JSONB(), nullable=False, server_default='{}'),
+        sa.Column('awards', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
         sa.Column('edited', sa.Boolean(), nullable=False, server_default='false'),
         sa.Column('engagement_score', sa.Float(), nullable=False, server_default='0.0'),
         sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
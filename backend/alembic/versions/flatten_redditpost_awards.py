@@ -0,0 +1,66 @@
+"""replace redditpost awards with award_count and top_award
+
+Revision ID: flatten_redditpost_awards
+Revises: redditpost_awards_jsonb
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'flatten_redditpost_awards'
+down_revision: Union[str, None] = 'redditpost_awards_jsonb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows backfilled per committed batch
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    # Add the flat columns; a constant default is metadata-only
+    op.execute(
+        "ALTER TABLE redditpost "
+        "ADD COLUMN IF NOT EXISTS award_count integer NOT NULL DEFAULT 0, "
+        "ADD COLUMN IF NOT EXISTS top_award varchar"
+    )
+
+    # Derive them from the {award name: count} map, committing each batch
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        max_id = connection.execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM redditpost")).scalar()
+        for low in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text("""
+                    UPDATE redditpost
+                    SET award_count = COALESCE(
+                            (SELECT sum(value::integer) FROM jsonb_each_text(awards::jsonb)), 0
+                        ),
+                        top_award = (
+                            SELECT key FROM jsonb_each_text(awards::jsonb)
+                            ORDER BY value::integer DESC
+                            LIMIT 1
+                        )
+                    WHERE id BETWEEN :low AND :high
+                      AND awards IS NOT NULL
+                      AND jsonb_typeof(awards::jsonb) = 'object'
+                      AND awards::jsonb <> '{}'::jsonb
+                """),
+                {"low": low, "high": low + BACKFILL_BATCH_SIZE - 1}
+            )
+
+    # Drop the full map; nothing reads more than the count and top award
+    op.execute("ALTER TABLE redditpost DROP COLUMN IF EXISTS awards")
+
+
+def downgrade() -> None:
+    # Restore the awards map from what the flat columns kept
+    op.execute("ALTER TABLE redditpost ADD COLUMN IF NOT EXISTS awards jsonb DEFAULT '{}'::jsonb")
+    op.execute(
+        "UPDATE redditpost SET awards = jsonb_build_object(top_award, award_count) "
+        "WHERE top_award IS NOT NULL"
+    )
+    op.execute("ALTER TABLE redditpost DROP COLUMN award_count, DROP COLUMN top_award")
@@ -0,0 +1,119 @@
+"""fold post analysis columns into redditpost
+
+Revision ID: fold_post_analysis_into_redditpost
+Revises: add_redditpost_metric_server_defaults
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'fold_post_analysis_into_redditpost'
+# Every head that alters postanalysis is merged in by the earlier
+# drop_post_analysis_string_columns, so all of them run before this drop
+down_revision: Union[str, None] = 'add_redditpost_metric_server_defaults'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows backfilled per committed batch
+BACKFILL_BATCH_SIZE = 10000
+
+# (index name, array column) on redditpost
+GIN_INDEXES = (
+    ('ix_redditpost_themes_gin', 'matching_themes'),
+    ('ix_redditpost_keywords_gin', 'keywords'),
+)
+
+
+def _backfill(statement: str, table: str) -> None:
+    """Run an id-ranged UPDATE, committing each batch."""
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        max_id = connection.execute(sa.text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")).scalar()
+        for low in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text(statement),
+                {"low": low, "high": low + BACKFILL_BATCH_SIZE - 1}
+            )
+
+
+def upgrade() -> None:
+    # Add the analysis columns; all nullable, so metadata-only
+    op.execute(
+        "ALTER TABLE redditpost "
+        "ADD COLUMN IF NOT EXISTS matching_themes varchar[], "
+        "ADD COLUMN IF NOT EXISTS keywords varchar[], "
+        "ADD COLUMN IF NOT EXISTS theme_scores jsonb, "
+        "ADD COLUMN IF NOT EXISTS analyzed_at timestamp with time zone"
+    )
+
+    # Copy each post's analysis across
+    _backfill("""
+        UPDATE redditpost
+        SET matching_themes = pa.matching_themes_array,
+            keywords = pa.keywords_array,
+            theme_scores = pa.theme_scores_jsonb,
+            analyzed_at = pa.analyzed_at
+        FROM postanalysis pa
+        WHERE pa.post_id = redditpost.id
+          AND redditpost.id BETWEEN :low AND :high
+    """, 'redditpost')
+
+    # Serve @> / && containment filters from an index
+    with op.get_context().autocommit_block():
+        for name, column in GIN_INDEXES:
+            op.create_index(
+                name,
+                'redditpost',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+    # Drop the 1:1 side table
+    op.execute("DROP TABLE IF EXISTS postanalysis")
+
+
+def downgrade() -> None:
+    # Recreate the side table
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS postanalysis (
+            id serial PRIMARY KEY,
+            post_id integer REFERENCES redditpost (id) ON DELETE CASCADE,
+            analyzed_at timestamp without time zone NOT NULL,
+            matching_themes_array varchar[],
+            keywords_array varchar[],
+            theme_scores_jsonb jsonb
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_postanalysis_themes_gin "
+        "ON postanalysis USING gin (matching_themes_array)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_postanalysis_keywords_gin "
+        "ON postanalysis USING gin (keywords_array)"
+    )
+
+    # Copy analysed posts back
+    _backfill("""
+        INSERT INTO postanalysis (post_id, analyzed_at, matching_themes_array, keywords_array, theme_scores_jsonb)
+        SELECT id, analyzed_at AT TIME ZONE 'UTC', matching_themes, keywords, theme_scores
+        FROM redditpost
+        WHERE analyzed_at IS NOT NULL
+          AND id BETWEEN :low AND :high
+    """, 'redditpost')
+
+    # Drop the folded columns; their GIN indexes go with them
+    op.execute(
+        "ALTER TABLE redditpost "
+        "DROP COLUMN matching_themes, "
+        "DROP COLUMN keywords, "
+        "DROP COLUMN theme_scores, "
+        "DROP COLUMN analyzed_at"
+    )
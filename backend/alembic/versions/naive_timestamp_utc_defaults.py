@@ -0,0 +1,54 @@
+"""default naive theme timestamps to UTC
+
+Revision ID: naive_timestamp_utc_defaults
+Revises: add_top_k_ranking_indexes
+Create Date: 2026-10-16 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'naive_timestamp_utc_defaults'
+down_revision: Union[str, None] = 'add_top_k_ranking_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) timestamp without time zone columns holding UTC
+NAIVE_UTC_COLUMNS = (
+    ('theme', 'created_at'),
+    ('theme', 'updated_at'),
+    ('themepost', 'added_at'),
+    ('themequestion', 'created_at'),
+    ('themequestion', 'updated_at'),
+)
+
+
+def _existing_columns() -> set:
+    """(table, column) pairs from NAIVE_UTC_COLUMNS present in this database."""
+    # The theme tables come from init_db's create_all rather than from a
+    # migration, so they may be missing
+    rows = op.get_bind().execute(sa.text(
+        "SELECT table_name, column_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema()"
+    ))
+    return set(NAIVE_UTC_COLUMNS) & {(table, column) for table, column in rows}
+
+
+def upgrade() -> None:
+    # now() in a naive column is the session's local time; convert to UTC so
+    # defaulted rows agree with the UTC values the app writes
+    existing = _existing_columns()
+    for table, column in NAIVE_UTC_COLUMNS:
+        if (table, column) in existing:
+            op.alter_column(table, column, server_default=sa.text("timezone('UTC', now())"))
+
+
+def downgrade() -> None:
+    # Restore plain now() defaults
+    existing = _existing_columns()
+    for table, column in NAIVE_UTC_COLUMNS:
+        if (table, column) in existing:
+            op.alter_column(table, column, server_default=sa.func.now())
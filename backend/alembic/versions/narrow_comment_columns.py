@@ -0,0 +1,48 @@
+"""narrow comments distinguished and awards columns
+
+Revision ID: narrow_comment_columns
+Revises: add_created_at_desc_indexes
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'narrow_comment_columns'
+down_revision: Union[str, None] = 'add_created_at_desc_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Values Reddit uses for comments.distinguished
+DISTINGUISHED_KINDS = ('moderator', 'admin', 'special')
+
+
+def upgrade() -> None:
+    # Create enum type for distinguished
+    postgresql.ENUM(*DISTINGUISHED_KINDS, name='distinguished_kind').create(op.get_bind(), checkfirst=True)
+
+    # Convert both columns in one rewrite: distinguished becomes a 4-byte enum,
+    # and empty awards are stored as NULL (a null-bitmap bit) with no default
+    op.execute("""
+        ALTER TABLE comments
+            ALTER COLUMN distinguished TYPE distinguished_kind
+                USING (CASE WHEN distinguished IN ('moderator', 'admin', 'special')
+                            THEN distinguished::distinguished_kind END),
+            ALTER COLUMN awards DROP DEFAULT,
+            ALTER COLUMN awards TYPE jsonb USING NULLIF(awards::jsonb, '{}'::jsonb)
+    """)
+
+
+def downgrade() -> None:
+    # Restore string distinguished and empty-object awards
+    op.execute("""
+        ALTER TABLE comments
+            ALTER COLUMN distinguished TYPE varchar USING distinguished::text,
+            ALTER COLUMN awards TYPE jsonb USING COALESCE(awards, '{}'::jsonb),
+            ALTER COLUMN awards SET DEFAULT '{}'::jsonb
+    """)
+    postgresql.ENUM(name='distinguished_kind').drop(op.get_bind(), checkfirst=True)
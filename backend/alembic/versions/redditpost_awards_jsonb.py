@@ -0,0 +1,37 @@
+"""store redditpost awards as jsonb
+
+Revision ID: redditpost_awards_jsonb
+Revises: add_post_analysis_gin_indexes
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'redditpost_awards_jsonb'
+down_revision: Union[str, None] = 'add_post_analysis_gin_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _awards_type() -> str:
+    """Current data type of redditpost.awards."""
+    return op.get_bind().execute(sa.text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_name = 'redditpost' AND column_name = 'awards'"
+    )).scalar()
+
+
+def upgrade() -> None:
+    # Migrated databases already have jsonb (f184c96f5c04); only tables built
+    # by create_all from the old model carry plain json and need the rewrite
+    if _awards_type() == 'json':
+        op.execute("ALTER TABLE redditpost ALTER COLUMN awards TYPE jsonb USING awards::jsonb")
+
+
+def downgrade() -> None:
+    # jsonb is what the migration history creates, so there is nothing to revert
+    pass
@@ -0,0 +1,44 @@
+"""backfill redditpost timestamptz shadow columns
+
+Revision ID: redditpost_timestamptz_backfill
+Revises: 93604021eee1
+Create Date: 2026-10-16 23:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'redditpost_timestamptz_backfill'
+down_revision: Union[str, None] = '93604021eee1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows backfilled per committed batch
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    # The expand revision's trigger keeps new writes in sync; copy existing
+    # rows across in id ranges, committing each batch
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        max_id = connection.execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM redditpost")).scalar()
+        for low in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text("""
+                    UPDATE redditpost
+                    SET created_at_tz = created_at AT TIME ZONE 'UTC',
+                        collected_at_tz = collected_at AT TIME ZONE 'UTC'
+                    WHERE id BETWEEN :low AND :high
+                      AND (created_at_tz IS NULL OR collected_at_tz IS NULL)
+                """),
+                {"low": low, "high": low + BACKFILL_BATCH_SIZE - 1}
+            )
+
+
+def downgrade() -> None:
+    # Nothing to undo; the expand revision drops the shadow columns
+    pass
@@ -0,0 +1,103 @@
+"""swap redditpost timestamptz shadow columns in
+
+Revision ID: redditpost_timestamptz_contract
+Revises: redditpost_timestamptz_backfill
+Create Date: 2026-10-16 23:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'redditpost_timestamptz_contract'
+down_revision: Union[str, None] = 'redditpost_timestamptz_backfill'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows backfilled per committed batch on downgrade
+BACKFILL_BATCH_SIZE = 10000
+
+# (timestamptz shadow, naive original) column pairs on redditpost
+SWAPPED_COLUMNS = (
+    ('created_at_tz', 'created_at'),
+    ('collected_at_tz', 'collected_at'),
+)
+
+
+def _set_not_null(columns: Sequence[str]) -> None:
+    """Mark redditpost columns NOT NULL without scanning under ACCESS EXCLUSIVE."""
+    # Add the checks unvalidated; the transaction commits when the
+    # autocommit block opens, releasing the ADD's lock
+    for column in columns:
+        op.execute(
+            f"ALTER TABLE redditpost ADD CONSTRAINT redditpost_{column}_not_null "
+            f"CHECK ({column} IS NOT NULL) NOT VALID"
+        )
+
+    # Validate on their own; the scan only holds SHARE UPDATE EXCLUSIVE
+    with op.get_context().autocommit_block():
+        for column in columns:
+            op.execute(f"ALTER TABLE redditpost VALIDATE CONSTRAINT redditpost_{column}_not_null")
+
+    # The validated checks let SET NOT NULL skip its own scan
+    for column in columns:
+        op.execute(f"ALTER TABLE redditpost ALTER COLUMN {column} SET NOT NULL")
+        op.execute(f"ALTER TABLE redditpost DROP CONSTRAINT redditpost_{column}_not_null")
+
+
+def upgrade() -> None:
+    # The originals were NOT NULL; carry that over before the swap
+    _set_not_null([shadow for shadow, _ in SWAPPED_COLUMNS])
+
+    # Contract: drop the sync trigger and swap the columns
+    op.execute("DROP TRIGGER redditpost_sync_timestamptz ON redditpost")
+    op.execute("DROP FUNCTION redditpost_sync_timestamptz()")
+    op.execute("ALTER TABLE redditpost DROP COLUMN created_at, DROP COLUMN collected_at")
+    for shadow, original in SWAPPED_COLUMNS:
+        op.execute(f"ALTER TABLE redditpost RENAME COLUMN {shadow} TO {original}")
+
+
+def downgrade() -> None:
+    # Move the timestamptz columns back to their shadow names
+    for shadow, original in SWAPPED_COLUMNS:
+        op.execute(f"ALTER TABLE redditpost RENAME COLUMN {original} TO {shadow}")
+        op.execute(f"ALTER TABLE redditpost ALTER COLUMN {shadow} DROP NOT NULL")
+
+    # Re-add the naive columns and fill them in id ranges
+    op.execute(
+        "ALTER TABLE redditpost "
+        "ADD COLUMN created_at timestamp without time zone, "
+        "ADD COLUMN collected_at timestamp without time zone"
+    )
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        max_id = connection.execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM redditpost")).scalar()
+        for low in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text("""
+                    UPDATE redditpost
+                    SET created_at = created_at_tz AT TIME ZONE 'UTC',
+                        collected_at = collected_at_tz AT TIME ZONE 'UTC'
+                    WHERE id BETWEEN :low AND :high
+                """),
+                {"low": low, "high": low + BACKFILL_BATCH_SIZE - 1}
+            )
+    _set_not_null([original for _, original in SWAPPED_COLUMNS])
+
+    # Restore the expand revision's sync trigger
+    op.execute("""
+        CREATE OR REPLACE FUNCTION redditpost_sync_timestamptz() RETURNS trigger AS $$
+        BEGIN
+            NEW.created_at_tz := NEW.created_at AT TIME ZONE 'UTC';
+            NEW.collected_at_tz := NEW.collected_at AT TIME ZONE 'UTC';
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER redditpost_sync_timestamptz
+        BEFORE INSERT OR UPDATE ON redditpost
+        FOR EACH ROW EXECUTE FUNCTION redditpost_sync_timestamptz()
+    """)
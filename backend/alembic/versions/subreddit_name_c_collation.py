@@ -0,0 +1,37 @@
+"""store subreddit names with C collation
+
+Revision ID: subreddit_name_c_collation
+Revises: flatten_redditpost_awards
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'subreddit_name_c_collation'
+down_revision: Union[str, None] = 'flatten_redditpost_awards'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) holding a subreddit name; the primary key comes first
+SUBREDDIT_NAME_COLUMNS = (
+    ('subreddits', 'name'),
+    ('redditpost', 'subreddit_name'),
+    ('audience_subreddits', 'subreddit_name'),
+)
+
+
+def upgrade() -> None:
+    # Only the collation changes, so rows are not rewritten; Postgres rebuilds
+    # the affected indexes and re-checks the foreign keys against it. Names
+    # stay unbounded, as user-profile subreddits exceed 21 characters
+    for table, column in SUBREDDIT_NAME_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE varchar COLLATE "C"')
+
+
+def downgrade() -> None:
+    # Back to unbounded varchar in the database default collation
+    for table, column in SUBREDDIT_NAME_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE varchar COLLATE "default"')
@@ -1,3 +1,5 @@
+import asyncio
+import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -5,9 +7,15 @@ import asyncpraw
 from asyncpraw.exceptions import PRAWException
 from asyncpraw.models import Comment, Submission, Subreddit
 
+from ..core.cache import get_cache
 from ..core.config import settings
 from ..models.comment import Comment as CommentModel
 
+logger = logging.getLogger(__name__)
+
+# Seconds to reuse a fetched comment thread before hitting Reddit again
+COMMENTS_CACHE_TTL = 60
+
 
 class RedditClient:
     def __init__(self):
@@ -36,6 +44,12 @@ class RedditClient:
         Returns:
             List of comment data dictionaries
         """
+        cache = get_cache()
+        cache_key = f"comments:{post_id}:{sort}:{limit}:{min_score}"
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             submission = await self.reddit.submission(id=post_id)
             
@@ -61,11 +75,12 @@ class RedditClient:
                 if comment_data:
                     comments.append(comment_data)
             
+            await cache.set(cache_key, comments, expire=COMMENTS_CACHE_TTL)
             return comments
             
         except PRAWException as e:
             # Log error and return empty list
-            print(f"Error fetching comments for post {post_id}: {str(e)}")
+            logger.error(f"Error fetching comments for post {post_id}: {str(e)}")
             return []
     
     async def get_comment(self, comment_id: str) -> Optional[Dict[str, Any]]:
@@ -84,12 +99,15 @@ class RedditClient:
             return await self._parse_comment(comment)
             
         except PRAWException as e:
-            print(f"Error fetching comment {comment_id}: {str(e)}")
+            logger.error(f"Error fetching comment {comment_id}: {str(e)}")
             return None
     
     async def _parse_comment(self, comment: Comment) -> Dict[str, Any]:
         """
-        Parse a PRAW comment into a dictionary
+        Parse a PRAW comment and its reply tree into a dictionary
+        
+        Replies are walked level by level; any reply on a level that still
+        needs loading is loaded concurrently with the rest of that level.
         
         Args:
             comment: PRAW comment object
@@ -97,24 +115,51 @@ class RedditClient:
         Returns:
             Dictionary with comment data
         """
-        # Get basic comment data
-        data = {
-            "id": comment.id,
-            "content": comment.body,
-            "author": str(comment.author) if comment.author else "[deleted]",
-            "score": comment.score,
-            "created_at": datetime.fromtimestamp(comment.created_utc),
-            "edited": bool(comment.edited),
-            "awards": len(getattr(comment, "all_awardings", [])),
-            "replies": []
-        }
+        root = self._extract_comment(comment)
+        frontier = [root]
+        
+        while frontier:
+            pending = [
+                (parent, reply)
+                for parent in frontier
+                for reply in parent.pop("_raw_replies")
+                if isinstance(reply, Comment)
+            ]
+            await asyncio.gather(*(self._maybe_load(reply) for _, reply in pending))
+            
+            frontier = []
+            for parent, reply in pending:
+                reply_data = self._extract_comment(reply)
+                parent["replies"].append(reply_data)
+                frontier.append(reply_data)
+        
+        return root
+    
+    def _extract_comment(self, comment: Comment) -> Dict[str, Any]:
+        """Extract a single comment's fields, keeping its raw replies for traversal."""
+        # Read fetched fields straight from the instance dict; attribute
+        # access on PRAW objects goes through the lazy-load machinery
+        data = comment.__dict__
         
-        # Get replies if they exist
-        if hasattr(comment, "replies") and comment.replies:
-            for reply in comment.replies:
-                if isinstance(reply, Comment):
-                    reply_data = await self._parse_comment(reply)
-                    if reply_data:
-                        data["replies"].append(reply_data)
+        def field(name: str, default: Any = None) -> Any:
+            if name in data:
+                return data[name]
+            return getattr(comment, name, default)
         
-        return data 
\ No newline at end of file
+        author = field("author")
+        return {
+            "id": field("id"),
+            "content": field("body"),
+            "author": str(author) if author else "[deleted]",
+            "score": field("score"),
+            "created_at": datetime.fromtimestamp(field("created_utc")),
+            "edited": bool(field("edited")),
+            "awards": len(field("all_awardings", [])),
+            "replies": [],
+            "_raw_replies": list(getattr(comment, "replies", None) or [])
+        }
+    
+    async def _maybe_load(self, comment: Comment) -> None:
+        """Load a comment only if its data was not already fetched with the thread."""
+        if "body" not in comment.__dict__:
+            await comment.load()
@@ -1,48 +1,75 @@
 """Cache module for storing AI responses."""
 
-import json
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import heapq
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
 
 
 class Cache:
-    """Simple in-memory cache with expiration."""
+    """Simple in-memory LRU cache with expiration."""
     
-    def __init__(self):
+    def __init__(self, max_size: int = 1024):
         """Initialize cache."""
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        self.max_size = max_size
+        self._cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # (expiry, key) pairs; entries may be stale and are skipped when swept
+        self._expiry_heap: List[Tuple[float, str]] = []
     
-    async def get(self, key: str) -> Optional[Dict]:
+    async def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired."""
-        if key not in self._cache:
+        entry = self._cache.get(key)
+        if entry is None:
             return None
             
-        entry = self._cache[key]
-        if datetime.utcnow() > entry['expires']:
+        expires, value = entry
+        if time.monotonic() > expires:
             del self._cache[key]
             return None
             
-        return entry['value']
+        self._cache.move_to_end(key)
+        return value
     
-    async def set(self, key: str, value: Dict, expire: int = 3600) -> None:
+    async def set(self, key: str, value: Any, expire: int = 3600) -> None:
         """Set value in cache with expiration in seconds."""
-        self._cache[key] = {
-            'value': value,
-            'expires': datetime.utcnow() + timedelta(seconds=expire)
-        }
+        now = time.monotonic()
+        self._evict_expired(now)
+        
+        expires = now + expire
+        self._cache[key] = (expires, value)
+        self._cache.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (expires, key))
+        
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
     
     async def delete(self, key: str) -> None:
         """Delete value from cache."""
-        if key in self._cache:
-            del self._cache[key]
+        self._cache.pop(key, None)
     
     async def clear(self) -> None:
         """Clear all values from cache."""
         self._cache.clear()
+        self._expiry_heap.clear()
+    
+    def _evict_expired(self, now: float) -> None:
+        """Drop expired entries from the front of the expiry heap."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Only evict if the key wasn't overwritten with a later expiry
+            if entry is not None and entry[0] == expires:
+                del self._cache[key]
+        
+        # Keep the heap from growing without bound from overwritten keys
+        if len(heap) > 2 * self.max_size:
+            self._expiry_heap = [(exp, k) for k, (exp, _) in self._cache.items()]
+            heapq.heapify(self._expiry_heap)
 
 # Global cache instance
 _cache = Cache()
 
 def get_cache() -> Cache:
     """Get the global cache instance."""
-    return _cache 
\ No newline at end of file
+    return _cache
@@ -1,5 +1,23 @@
 import asyncio
-from typing import Callable, List, Optional
+import logging
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _run_callbacks(callbacks: Iterable[Callable[[], None]], kind: str) -> None:
+    """Run callbacks in order, logging any that fail and continuing with the rest."""
+    # One try frame around the loop; after a failure the shared iterator
+    # resumes with the next callback. Iterate a snapshot, since a callback
+    # may register another and resize the dict mid-loop
+    remaining = iter(tuple(callbacks))
+    while True:
+        try:
+            for callback in remaining:
+                callback()
+            return
+        except Exception:
+            logger.exception(f"{kind} callback failed")
 
 
 class CancellationToken:
@@ -7,8 +25,9 @@ class CancellationToken:
     
     def __init__(self):
         self._is_cancelled = False
-        self._cancel_callbacks: List[Callable[[], None]] = []
-        self._cleanup_callbacks: List[Callable[[], None]] = []
+        # Created on first registration; dicts keep insertion order and dedupe in O(1)
+        self._cancel_callbacks: Optional[Dict[Callable[[], None], None]] = None
+        self._cleanup_callbacks: Optional[Dict[Callable[[], None], None]] = None
     
     @property
     def is_cancelled(self) -> bool:
@@ -20,11 +39,8 @@ class CancellationToken:
         if not self._is_cancelled:
             self._is_cancelled = True
             # Execute cancel callbacks
-            for callback in self._cancel_callbacks:
-                try:
-                    callback()
-                except Exception:
-                    pass  # Ignore callback errors
+            if self._cancel_callbacks:
+                _run_callbacks(self._cancel_callbacks, "Cancel")
     
     def throw_if_cancelled(self) -> None:
         """Raise CancellationError if the operation is cancelled."""
@@ -38,23 +54,24 @@ class CancellationToken:
     
     def register_cancel_callback(self, callback: Callable[[], None]) -> None:
         """Register a callback to be called when cancellation occurs."""
-        if callback not in self._cancel_callbacks:
-            self._cancel_callbacks.append(callback)
+        if self._cancel_callbacks is None:
+            self._cancel_callbacks = {callback: None}
+        else:
+            self._cancel_callbacks[callback] = None
     
     def register_cleanup_callback(self, callback: Callable[[], None]) -> None:
         """Register a callback to be called during cleanup."""
-        if callback not in self._cleanup_callbacks:
-            self._cleanup_callbacks.append(callback)
+        if self._cleanup_callbacks is None:
+            self._cleanup_callbacks = {callback: None}
+        else:
+            self._cleanup_callbacks[callback] = None
     
     def cleanup(self) -> None:
         """Execute cleanup callbacks."""
-        for callback in self._cleanup_callbacks:
-            try:
-                callback()
-            except Exception:
-                pass  # Ignore cleanup errors
-        self._cleanup_callbacks.clear()
-        self._cancel_callbacks.clear()
+        if self._cleanup_callbacks:
+            _run_callbacks(self._cleanup_callbacks, "Cleanup")
+        self._cleanup_callbacks = None
+        self._cancel_callbacks = None
 
 class CancellationScope:
     """A context manager for managing cancellation tokens."""
@@ -62,11 +79,19 @@ class CancellationScope:
     def __init__(self, token: Optional[CancellationToken] = None):
         self.token = token or CancellationToken()
     
-    async def __aenter__(self) -> CancellationToken:
+    # Entering and exiting never awaits, so the plain `with` form is preferred;
+    # the async methods are kept for existing `async with` callers
+    def __enter__(self) -> CancellationToken:
         return self.token
     
-    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.token.cleanup()
         if exc_type is asyncio.CancelledError and not self.token.is_cancelled:
             # Convert external cancellation to our token
-            self.token.cancel() 
\ No newline at end of file
+            self.token.cancel()
+    
+    async def __aenter__(self) -> CancellationToken:
+        return self.__enter__()
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.__exit__(exc_type, exc_val, exc_tb) 
\ No newline at end of file
@@ -1,5 +1,18 @@
 """Configuration for post and comment collection."""
 
+from types import MappingProxyType
+from typing import Any, Tuple
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only proxies and turn lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 POST_COLLECTION_CONFIG = {
     'distribution': {
         'hot': {
@@ -61,4 +74,16 @@ COMMENT_QUALITY_FILTERS = {
         'distinguished': 1.3,
         'awarded': 1.2
     }
-} 
\ No newline at end of file
+}
+
+# Configs are read-only at runtime
+POST_COLLECTION_CONFIG = _freeze(POST_COLLECTION_CONFIG)
+COMMENT_COLLECTION_CONFIG = _freeze(COMMENT_COLLECTION_CONFIG)
+COMMENT_QUALITY_FILTERS = _freeze(COMMENT_QUALITY_FILTERS)
+
+# Post distribution flattened for collection loops:
+# (sort method, weight, min_score, time_filters)
+POST_DISTRIBUTION: Tuple[Tuple[str, float, int, Tuple[str, ...]], ...] = tuple(
+    (method, config['weight'], config['min_score'], config.get('time_filters', ()))
+    for method, config in POST_COLLECTION_CONFIG['distribution'].items()
+)
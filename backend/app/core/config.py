@@ -7,6 +7,11 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./app.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool = False  # Log every SQL statement; enable for local debugging only
 
     # Reddit API
     REDDIT_CLIENT_ID: str
@@ -16,6 +21,9 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str
 
+    # Background collection
+    COLLECTION_CONCURRENCY: int = 5  # Audiences collected at once by the hourly update
+
     # API Settings
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Reddit Audience Research Tool"
@@ -29,4 +37,5 @@ class Settings(BaseSettings):
 def get_settings() -> Settings:
     return Settings()
 
-settings = Settings() 
\ No newline at end of file
+# Same cached instance get_settings() returns, so .env is parsed once per process
+settings = get_settings()
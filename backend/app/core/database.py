@@ -1,34 +1,114 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Optional, Sequence
 
+import orjson
 from app.core.config import get_settings
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import JSON, Table, text
+from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
+                                    create_async_engine)
 from sqlmodel import SQLModel
 
 settings = get_settings()
 
+# Disable asyncpg's prepared statement caches. The alembic migrations change
+# column types and rebuild tables while the app may be running, which
+# invalidates cached plans ("cached plan must not change result type") on
+# every pooled connection until it is recycled.
+ASYNCPG_CONNECT_ARGS = {
+    "statement_cache_size": 0,
+    "prepared_statement_cache_size": 0,
+}
+
+
+def _orjson_serializer(value: Any) -> str:
+    """Serialize JSON/JSONB bind values with orjson."""
+    return orjson.dumps(value).decode()
+
+
+# JSON/JSONB columns (theme scores, comment awards) round-trip through orjson
+# instead of the stdlib json module
+JSON_ENGINE_ARGS = {
+    "json_serializer": _orjson_serializer,
+    "json_deserializer": orjson.loads,
+}
+
 # Create async engine with proper async PostgreSQL URL
 engine = create_async_engine(
     settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
-    echo=True
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_use_lifo=True,
+    insertmanyvalues_page_size=1000,
+    connect_args=ASYNCPG_CONNECT_ARGS,
+    **JSON_ENGINE_ARGS
 )
 
 # Create async session factory
-AsyncSessionLocal = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False
-)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 # Dependency to get async database session
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
+
+# The asyncpg connection behind a session, inside the session's transaction
+async def driver_connection(session: AsyncSession) -> Any:
+    """Return the asyncpg connection the session is currently using."""
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    return raw_connection.driver_connection
+
+# COPY rows over the session's own connection, inside its transaction
+async def bulk_copy(
+    session: AsyncSession,
+    table: Table,
+    rows: Sequence[Dict[str, Any]],
+    columns: Sequence[str],
+    conflict_columns: Optional[Sequence[str]] = None
+) -> None:
+    """Write rows with a single COPY instead of one INSERT per row.
+
+    With conflict_columns, rows are COPYed into a temp staging table and moved
+    across with INSERT ... ON CONFLICT DO NOTHING, so rows another writer has
+    already inserted are skipped instead of failing the whole COPY.
+    """
+    # COPY bypasses the JSON bind processing, so serialize those values here
+    json_columns = {name for name in columns if isinstance(table.c[name].type, JSON)}
+    records = [
+        tuple(
+            _orjson_serializer(row[name]) if name in json_columns and row[name] is not None else row[name]
+            for name in columns
+        )
+        for row in rows
+    ]
+    if conflict_columns is None:
+        connection = await driver_connection(session)
+        await connection.copy_records_to_table(
+            table.name,
+            records=records,
+            columns=list(columns)
+        )
+        return
+
+    stage = f"{table.name}_copy_stage"
+    column_list = ", ".join(f'"{name}"' for name in columns)
+    await session.execute(text(
+        f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+        f"SELECT {column_list} FROM {table.name} WITH NO DATA"
+    ))
+    connection = await driver_connection(session)
+    await connection.copy_records_to_table(
+        stage,
+        records=records,
+        columns=list(columns)
+    )
+    await session.execute(text(
+        f"INSERT INTO {table.name} ({column_list}) SELECT {column_list} FROM {stage} "
+        f"ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING"
+    ))
+    await session.execute(text(f"DROP TABLE {stage}"))
 
 # Create tables async
 async def init_db():
@@ -1,6 +1,4 @@
-from typing import AsyncGenerator
-
-from app.core.database import get_async_session
+from app.core.database import get_session
 from app.services.reddit import RedditService
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,7 +8,6 @@ async def get_async_reddit_service() -> RedditService:
     """Get an async RedditService instance."""
     return RedditService(use_async=True)
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get a database session."""
-    async for session in get_async_session():
-        yield session 
\ No newline at end of file
+# Alias rather than a wrapping generator so FastAPI drives get_session directly
+get_db_session = get_session
+ 
\ No newline at end of file
@@ -1,57 +1,54 @@
 from typing import Any, Dict
 
+import orjson
 from asyncprawcore.exceptions import ResponseException as RedditAPIError
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.exc import SQLAlchemyError
 
+# Serialized once; returned for not-found errors that carry no message of their own
+_NOT_FOUND_BODY = orjson.dumps({"detail": "Resource not found"})
 
-async def database_error_handler(request: Request, exc: SQLAlchemyError) -> JSONResponse:
-    """Handle database-related errors."""
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+
+def _error_response(status_code: int, detail: str, exc: Exception) -> ORJSONResponse:
+    """Build an error response with the exception message."""
+    return ORJSONResponse(
+        status_code=status_code,
         content={
-            "detail": "Database error occurred",
+            "detail": detail,
             "message": str(exc)
         }
     )
 
-async def reddit_api_error_handler(request: Request, exc: RedditAPIError) -> JSONResponse:
+async def database_error_handler(request: Request, exc: SQLAlchemyError) -> ORJSONResponse:
+    """Handle database-related errors."""
+    return _error_response(status.HTTP_500_INTERNAL_SERVER_ERROR, "Database error occurred", exc)
+
+async def reddit_api_error_handler(request: Request, exc: RedditAPIError) -> ORJSONResponse:
     """Handle Reddit API-related errors."""
-    return JSONResponse(
-        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-        content={
-            "detail": "Reddit API error occurred",
-            "message": str(exc)
-        }
-    )
+    return _error_response(status.HTTP_503_SERVICE_UNAVAILABLE, "Reddit API error occurred", exc)
 
-async def validation_error_handler(request: Request, exc: Exception) -> JSONResponse:
+async def validation_error_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Handle validation errors."""
-    return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={
-            "detail": "Validation error",
-            "message": str(exc)
-        }
-    )
+    return _error_response(status.HTTP_422_UNPROCESSABLE_ENTITY, "Validation error", exc)
 
-async def not_found_error_handler(request: Request, exc: Exception) -> JSONResponse:
+async def not_found_error_handler(request: Request, exc: Exception) -> Response:
     """Handle not found errors."""
-    return JSONResponse(
+    message = str(exc)
+    if not message:
+        return Response(
+            content=_NOT_FOUND_BODY,
+            status_code=status.HTTP_404_NOT_FOUND,
+            media_type="application/json"
+        )
+    return ORJSONResponse(
         status_code=status.HTTP_404_NOT_FOUND,
         content={
             "detail": "Resource not found",
-            "message": str(exc)
+            "message": message
         }
     )
 
-async def generic_error_handler(request: Request, exc: Exception) -> JSONResponse:
+async def generic_error_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Handle any unhandled exceptions."""
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "detail": "Internal server error",
-            "message": str(exc)
-        }
-    ) 
\ No newline at end of file
+    return _error_response(status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error", exc)
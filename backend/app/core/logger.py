@@ -1,35 +1,37 @@
 import logging
+from functools import lru_cache
 from typing import Optional
 
+# Shared by every handler get_logger creates
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
 
+
+@lru_cache(maxsize=None)
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """Get a logger instance.
-    
+
     Args:
         name: The name for the logger. If None, returns the root logger.
-        
+
     Returns:
         A configured logger instance.
     """
     logger = logging.getLogger(name)
-    
+
     if not logger.handlers:
         # Set logging level
         logger.setLevel(logging.INFO)
-        
+
         # Create console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        
+
         # Add formatter to handler
-        console_handler.setFormatter(formatter)
-        
+        console_handler.setFormatter(_FORMATTER)
+
         # Add handler to logger
         logger.addHandler(console_handler)
-    
-    return logger 
\ No newline at end of file
+
+    return logger
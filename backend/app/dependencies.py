@@ -1,16 +1,12 @@
-from typing import AsyncGenerator
-
 from app.core.database import get_session
 from app.services.reddit import RedditService
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Request
 
 
-async def get_reddit_service(db: AsyncSession = Depends(get_session)) -> RedditService:
-    """Dependency for getting RedditService instance."""
-    return RedditService(db)
+def get_reddit_service(request: Request) -> RedditService:
+    """Dependency for getting the app-wide RedditService instance."""
+    return request.app.state.reddit_service
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get a database session."""
-    async for session in get_session():
-        yield session 
\ No newline at end of file
+# Alias rather than a wrapping generator so FastAPI drives get_session directly
+get_db_session = get_session
+ 
\ No newline at end of file
@@ -1,20 +1,26 @@
 import asyncio
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import uvicorn
+from app.core.config import settings
 from app.core.database import AsyncSessionLocal, init_db
 from app.models import Audience
+from app.routers.audiences import cancel_initial_collections
 from app.routers.audiences import router as audience_router
 from app.routers.subreddits import router as subreddit_router
 from app.routers.theme_questions import router as theme_questions_router
 from app.routers.themes import router as theme_router
+from app.services.reddit import RedditService
 from app.services.themes import ThemeService
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlmodel import select
 
 # Get the absolute path to the backend directory
@@ -26,10 +32,9 @@ logs_dir.mkdir(exist_ok=True)
 
 # Configure logging
 log_file = logs_dir / f"app_{datetime.now().strftime('%Y%m%d')}.log"
-print(f"Setting up logging to file: {log_file}")  # Debug print
 
-# Create file handler
-file_handler = logging.FileHandler(log_file)
+# Create file handler, rotated at 50MB
+file_handler = RotatingFileHandler(log_file, maxBytes=50 * 1024 * 1024, backupCount=5)
 file_handler.setLevel(logging.DEBUG)
 file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 
@@ -38,6 +43,13 @@ console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.DEBUG)
 console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 
+# Loggers only enqueue records; a listener thread does the file and console
+# writes so the event loop never blocks on log I/O
+log_queue = queue.SimpleQueue()
+queue_handler = QueueHandler(log_queue)
+log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+log_listener.start()
+
 # Remove all existing handlers from the root logger
 root_logger = logging.getLogger()
 root_logger.handlers = []
@@ -45,16 +57,22 @@ root_logger.handlers = []
 # Configure root logger
 logging.basicConfig(
     level=logging.DEBUG,
-    handlers=[file_handler, console_handler],
+    handlers=[queue_handler],
     force=True
 )
 
-# Configure specific loggers without adding duplicate handlers
-for logger_name in ['asyncpraw', 'asyncprawcore', 'urllib3', 'app']:
+# Configure specific loggers without adding duplicate handlers; third-party
+# clients log every request at DEBUG, so keep them to warnings
+for logger_name, level in [
+    ('asyncpraw', logging.WARNING),
+    ('asyncprawcore', logging.WARNING),
+    ('urllib3', logging.WARNING),
+    ('app', logging.DEBUG),
+]:
     module_logger = logging.getLogger(logger_name)
-    module_logger.setLevel(logging.DEBUG)
+    module_logger.setLevel(level)
     module_logger.propagate = False  # Prevent propagation to parent loggers
-    module_logger.handlers = [file_handler, console_handler]  # Set handlers directly
+    module_logger.handlers = [queue_handler]  # Set handlers directly
 
 # Create logger
 logger = logging.getLogger(__name__)
@@ -73,26 +91,39 @@ async def update_audience_data():
     """Background task to systematically collect new Reddit posts for all audiences."""
     while should_continue_background_tasks:
         try:
+            # Compare the column against a precomputed bound so the filter stays sargable
+            stale_before = datetime.now(timezone.utc) - timedelta(hours=1)
             async with AsyncSessionLocal() as db:
                 # Get all audience IDs using async session
                 result = await db.execute(
-                    select(Audience).where(
+                    select(Audience.id).where(
                         (Audience.is_collecting == False) &  # Only collect for non-collecting audiences
                         (
                             (Audience.last_collection_time == None) |  # Never collected
-                            (datetime.now(timezone.utc) - Audience.last_collection_time > timedelta(hours=1))  # Or collected over 1 hour ago
+                            (Audience.last_collection_time < stale_before)  # Or collected over 1 hour ago
                         )
                     )
                 )
-                audience_ids = [a.id for a in result.scalars().all()]
+                audience_ids = result.scalars().all()
+            
+            # Process audiences concurrently, bounded by the semaphore
+            semaphore = asyncio.Semaphore(settings.COLLECTION_CONCURRENCY)
             
-                # Process audiences one at a time
-                for audience_id in audience_ids:
-                    theme_service = ThemeService(db)
-                    # Only collect new posts, don't analyze themes
-                    await theme_service.collect_posts_for_audience(audience_id)
-                    # Small delay between processing each audience to prevent overload
-                    await asyncio.sleep(1)
+            async def collect_for_audience(audience_id: int) -> None:
+                async with semaphore:
+                    # Each task gets its own session; AsyncSession is not safe to share
+                    async with AsyncSessionLocal() as session:
+                        theme_service = ThemeService(session)
+                        # Only collect new posts, don't analyze themes
+                        await theme_service.collect_posts_for_audience(audience_id)
+            
+            results = await asyncio.gather(
+                *(collect_for_audience(audience_id) for audience_id in audience_ids),
+                return_exceptions=True
+            )
+            for audience_id, result in zip(audience_ids, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error collecting posts for audience {audience_id}: {str(result)}")
                 
         except Exception as e:
             logger.error(f"Error in background task: {str(e)}")
@@ -106,21 +137,34 @@ async def lifespan(app: FastAPI):
     # Initialize database tables
     await init_db()
     
+    # Share one Reddit client across requests instead of building one per request
+    app.state.reddit_service = RedditService()
+    
     # Start background task
     background_task = asyncio.create_task(update_audience_data())
     
     yield
     
+    # Stop initial collections for newly created audiences
+    await cancel_initial_collections()
+    
     # Stop background task
     global should_continue_background_tasks
     should_continue_background_tasks = False
     await background_task
+    
+    # Close the shared Reddit client
+    await app.state.reddit_service.close()
+    
+    # Flush queued log records
+    log_listener.stop()
 
 app = FastAPI(
     title="Reddit Audience Research Tool",
     description="A specialized tool for Reddit audience research and analysis",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -147,4 +191,14 @@ async def root():
     }
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8001, reload=True) 
\ No newline at end of file
+    # Auto-reload is for development only and cannot be combined with workers
+    reload = os.getenv("UVICORN_RELOAD", "false").lower() == "true"
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8001,
+        reload=reload,
+        loop="uvloop",
+        http="httptools",
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", "1"))
+    ) 
\ No newline at end of file
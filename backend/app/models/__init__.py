@@ -2,7 +2,6 @@ from sqlmodel import SQLModel
 
 from .audience import Audience, AudienceSubreddit
 from .comment import Comment
-from .post_analysis import PostAnalysis
 from .reddit_post import RedditPost
 from .subreddit import Subreddit
 from .theme import Theme, ThemePost
@@ -17,6 +16,5 @@ __all__ = [
     "Theme",
     "ThemePost",
     "ThemeQuestion",
-    "PostAnalysis",
     "Comment"
 ] 
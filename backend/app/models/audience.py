@@ -1,24 +1,34 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, Index, func, text
 from sqlmodel import Field, ForeignKey, Integer, Relationship, SQLModel
 
+from .subreddit import SUBREDDIT_NAME_TYPE
+
 
 class Audience(SQLModel, table=True):
     """Model for storing audience information"""
     __tablename__ = "audiences"
+    __table_args__ = (
+        Index("ix_audiences_is_collecting_active", "id", postgresql_where=text("is_collecting")),
+        Index(
+            "ix_audiences_collection_in_progress",
+            "id",
+            postgresql_where=text("collection_progress > 0 AND collection_progress < 100")
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True)
     description: Optional[str] = None
     created_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True)),
-        default_factory=lambda: datetime.now(timezone.utc)
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now())
     )
     updated_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True)),
-        default_factory=lambda: datetime.now(timezone.utc)
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     )
     last_collection_time: Optional[datetime] = Field(
         sa_column=Column(DateTime(timezone=True)),
@@ -34,21 +44,27 @@ class Audience(SQLModel, table=True):
     themes: List["Theme"] = Relationship(back_populates="audience", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
 
     class Config:
-        json_encoders = {
-            datetime: lambda dt: dt.isoformat() if dt else None
-        }
         from_attributes = True
 
 
 class AudienceSubreddit(SQLModel, table=True):
     """Junction table for many-to-many relationship between audiences and subreddits"""
     __tablename__ = "audience_subreddits"
+    __table_args__ = (
+        Index(
+            "ix_audience_subreddits_audience_cover",
+            "audience_id",
+            "added_at",
+            postgresql_include=["subreddit_name"]
+        ),
+        Index("ix_audience_subreddits_subreddit_audience", "subreddit_name", "audience_id"),
+    )
 
     audience_id: int = Field(sa_column=Column(Integer, ForeignKey("audiences.id", ondelete="CASCADE"), primary_key=True))
-    subreddit_name: str = Field(foreign_key="subreddits.name", primary_key=True)
+    subreddit_name: str = Field(sa_column=Column(SUBREDDIT_NAME_TYPE, ForeignKey("subreddits.name", ondelete="CASCADE"), primary_key=True))
     added_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True)),
-        default_factory=lambda: datetime.now(timezone.utc)
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now())
     )
 
     # Relationships
@@ -56,7 +72,4 @@ class AudienceSubreddit(SQLModel, table=True):
     subreddit: "Subreddit" = Relationship(back_populates="audiences")
 
     class Config:
-        json_encoders = {
-            datetime: lambda dt: dt.isoformat() if dt else None
-        }
         from_attributes = True 
\ No newline at end of file
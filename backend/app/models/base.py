@@ -1,6 +1,7 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import func
 from sqlmodel import Field, SQLModel
 
 
@@ -9,10 +10,10 @@ class TimestampedBase(SQLModel):
     __abstract__ = True
 
     created_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column_kwargs={"server_default": "CURRENT_TIMESTAMP"}
+        default=None,
+        sa_column_kwargs={"server_default": func.now()}
     )
     updated_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column_kwargs={"server_default": "CURRENT_TIMESTAMP", "onupdate": lambda: datetime.now(timezone.utc)}
+        default=None,
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()}
     ) 
\ No newline at end of file
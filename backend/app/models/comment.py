@@ -1,16 +1,25 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import (ARRAY, JSON, Boolean, Column, DateTime, Float,
-                        ForeignKey, Integer, String)
+from sqlalchemy import (ARRAY, JSON, Boolean, Column, DateTime, Enum, Float,
+                        ForeignKey, Index, Integer, String, func, text)
 from sqlalchemy.orm import foreign
 from sqlmodel import Field, Relationship, SQLModel
 
 from .reddit_post import RedditPost
 
+# Values Reddit uses for a distinguished comment
+DISTINGUISHED_KINDS = ("moderator", "admin", "special")
+
 
 class Comment(SQLModel, table=True):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_reddit_id_post", "reddit_id", "post_id"),
+        Index("ix_comments_created_at_desc", text("created_at DESC")),
+        # Serves each post's top comments by engagement without a sort
+        Index("ix_comments_post_engagement", "post_id", text("engagement_score DESC NULLS LAST")),
+    )
     
     id: Optional[int] = Field(default=None, sa_column=Column(Integer, primary_key=True))
     reddit_id: str = Field(unique=True, index=True)
@@ -22,15 +31,18 @@ class Comment(SQLModel, table=True):
     depth: int = Field(default=0, ge=0)
     path: List[int] = Field(sa_column=Column(ARRAY(Integer), server_default="{}"))
     is_submitter: bool = Field(default=False)
-    distinguished: Optional[str] = Field(default=None)
+    distinguished: Optional[str] = Field(
+        default=None,
+        sa_column=Column(Enum(*DISTINGUISHED_KINDS, name="distinguished_kind"))
+    )
     stickied: bool = Field(default=False)
-    awards: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    awards: Optional[dict] = Field(default=None, sa_column=Column(JSON(none_as_null=True)))  # NULL when no awards
     edited: bool = Field(default=False)
     engagement_score: float = Field(default=0.0)
     created_at: datetime = Field(sa_column=Column(DateTime(timezone=True)))
     collected_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True)),
-        default_factory=lambda: datetime.now(timezone.utc)
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now())
     )
     
     # Temporary field to store Reddit parent ID during collection
@@ -1,74 +1,93 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, List, Optional
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Integer, String
+from sqlalchemy import (Boolean, Column, DateTime, Float, Index, Integer, String,
+                        text)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlmodel import Field, ForeignKey, Relationship, SQLModel
 
-from .subreddit import Subreddit
+from .subreddit import SUBREDDIT_NAME_TYPE, Subreddit
+
+# Fields returned by RedditPost.dict(), in order. The theme analysis columns
+# are left out: they are written by the analysis step, not by collection
+_DICT_FIELDS = (
+    'id', 'reddit_id', 'title', 'content', 'url', 'author', 'score',
+    'num_comments', 'created_at', 'collected_at', 'subreddit_name', 'is_self',
+    'upvote_ratio', 'is_original_content', 'distinguished', 'stickied',
+    'collection_source', 'engagement_score', 'award_count', 'top_award'
+)
 
 
 class RedditPost(SQLModel, table=True):
     """Reddit post model."""
     __tablename__ = "redditpost"
+    __table_args__ = (
+        Index("ix_redditpost_created_at_desc", text("created_at DESC")),
+        Index("ix_redditpost_collected_at_desc", text("collected_at DESC")),
+        # Covers per-subreddit "newest first" listings without heap fetches
+        Index(
+            "ix_redditpost_sub_created",
+            "subreddit_name",
+            text("created_at DESC"),
+            postgresql_include=["score", "num_comments", "title"]
+        ),
+        Index("ix_redditpost_themes_gin", "matching_themes", postgresql_using="gin"),
+        Index("ix_redditpost_keywords_gin", "keywords", postgresql_using="gin"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     reddit_id: str = Field(unique=True, index=True)
-    subreddit_name: str = Field(sa_column=Column(String, ForeignKey("subreddits.name", ondelete="CASCADE")))
+    subreddit_name: str = Field(sa_column=Column(SUBREDDIT_NAME_TYPE, ForeignKey("subreddits.name", ondelete="CASCADE")))
     title: str
     content: str
     url: str
     author: str
-    score: int = Field(default=0)
-    num_comments: int = Field(default=0)
+    score: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    num_comments: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     created_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True)),
-        default_factory=lambda: datetime.now(timezone.utc)
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now())
     )
     collected_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True)),
-        default_factory=lambda: datetime.now(timezone.utc)
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now())
     )
     
     # New fields for enhanced post collection
     is_self: bool = Field(default=True)
-    upvote_ratio: float = Field(default=1.0)
+    upvote_ratio: float = Field(default=1.0, sa_column_kwargs={"server_default": "1.0"})
     is_original_content: bool = Field(default=False)
     distinguished: Optional[str] = Field(default=None)
     stickied: bool = Field(default=False)
     collection_source: Optional[str] = Field(default=None)
-    engagement_score: float = Field(default=0.0)
-    awards: dict = Field(default={}, sa_column=Column(JSON))
+    engagement_score: float = Field(default=0.0, sa_column_kwargs={"server_default": "0.0"})
+    award_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})  # Total awards received
+    top_award: Optional[str] = Field(default=None)  # Most-given award name
+    
+    # Theme analysis, filled in by ThemeService._analyze_post
+    matching_themes: Optional[List[str]] = Field(default=None, sa_column=Column(ARRAY(String)))
+    keywords: Optional[List[str]] = Field(default=None, sa_column=Column(ARRAY(String)))
+    theme_scores: Optional[dict] = Field(default=None, sa_column=Column(JSONB(none_as_null=True)))
+    analyzed_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True)))
     
     # Relationships
     subreddit: Subreddit = Relationship(back_populates="reddit_posts")
-    theme_posts: List["ThemePost"] = Relationship(back_populates="post", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
-    comments: List["Comment"] = Relationship(back_populates="post", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
+    # Children are removed by the FKs' ON DELETE CASCADE, not tracked by the ORM
+    theme_posts: List["ThemePost"] = Relationship(back_populates="post", sa_relationship_kwargs={"passive_deletes": "all"})
+    comments: List["Comment"] = Relationship(back_populates="post", sa_relationship_kwargs={"passive_deletes": "all"})
 
     def dict(self) -> Dict:
         """Convert model to dictionary."""
-        return {
-            'id': self.id,
-            'reddit_id': self.reddit_id,
-            'title': self.title,
-            'content': self.content,
-            'url': self.url,
-            'author': self.author,
-            'score': self.score,
-            'num_comments': self.num_comments,
-            'created_at': self.created_at,
-            'collected_at': self.collected_at,
-            'subreddit_name': self.subreddit_name,
-            'is_self': self.is_self,
-            'upvote_ratio': self.upvote_ratio,
-            'is_original_content': self.is_original_content,
-            'distinguished': self.distinguished,
-            'stickied': self.stickied,
-            'collection_source': self.collection_source,
-            'engagement_score': self.engagement_score,
-            'awards': self.awards
-        }
+        # Read the instance state directly rather than one instrumented
+        # attribute access per field; expired or deferred fields fall back
+        # to attribute access so they still load
+        values = self.__dict__
+        try:
+            return {field: values[field] for field in _DICT_FIELDS}
+        except KeyError:
+            return {field: getattr(self, field) for field in _DICT_FIELDS}
 
     class Config:
         from_attributes = True
@@ -1,26 +1,32 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, String, func
 from sqlmodel import Field, Relationship, SQLModel
 
+# Subreddit names are ASCII; "C" collation compares them bytewise instead of
+# through the locale. Left unbounded, since user-profile subreddits
+# ("u_<username>") can run past the 21 characters of regular ones. Shared by
+# every FK column
+SUBREDDIT_NAME_TYPE = String(collation="C")
+
 
 class Subreddit(SQLModel, table=True):
     """Model for storing subreddit information"""
     __tablename__ = "subreddits"
 
-    name: str = Field(primary_key=True)  # Using name as the primary key
+    name: str = Field(sa_column=Column(SUBREDDIT_NAME_TYPE, primary_key=True))  # Using name as the primary key
     display_name: str
     description: Optional[str] = None
     subscribers: int = Field(default=0)
     active_users: Optional[int] = Field(default=0)  # Number of active users
     created_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True)),
-        default_factory=lambda: datetime.now(timezone.utc)
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now())
     )
     updated_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True)),
-        default_factory=lambda: datetime.now(timezone.utc)
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now())
     )
     
     # Metrics
@@ -29,8 +35,8 @@ class Subreddit(SQLModel, table=True):
     growth_rate: Optional[float] = None
     relevance_score: Optional[float] = Field(default=0.0)  # Score for search relevance
     last_updated: datetime = Field(
-        sa_column=Column(DateTime(timezone=True)),
-        default_factory=lambda: datetime.now(timezone.utc)
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now())
     )
     
     # Relationships
@@ -41,8 +47,5 @@ class Subreddit(SQLModel, table=True):
         return f"<Subreddit {self.name}>"
     
     class Config:
-        json_encoders = {
-            datetime: lambda dt: dt.isoformat() if dt else None
-        }
         from_attributes = True
         populate_by_name = True 
\ No newline at end of file
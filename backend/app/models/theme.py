@@ -1,6 +1,7 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import List, Optional
 
+from sqlalchemy import Index, func, text
 from sqlmodel import Column, Field, ForeignKey, Integer, Relationship, SQLModel
 
 from .audience import Audience
@@ -8,10 +9,16 @@ from .theme_question import ThemeQuestion
 
 
 class ThemePost(SQLModel, table=True):
+    __table_args__ = (
+        # Serves a theme's posts in relevance order without a sort
+        Index("ix_themepost_theme_relevance", "theme_id", text("relevance_score DESC NULLS LAST")),
+    )
+    
     theme_id: int = Field(sa_column=Column(Integer, ForeignKey("theme.id", ondelete="CASCADE"), primary_key=True))
     post_id: int = Field(sa_column=Column(Integer, ForeignKey("redditpost.id", ondelete="CASCADE"), primary_key=True))
     relevance_score: float = Field(default=0.0)  # AI-generated relevance score
-    added_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Naive UTC, like the Theme and ThemeQuestion timestamps
+    added_at: datetime = Field(default=None, sa_column_kwargs={"server_default": func.timezone("UTC", func.now())})
 
     # Relationships
     theme: "Theme" = Relationship(back_populates="theme_posts")
@@ -23,8 +30,8 @@ class Theme(SQLModel, table=True):
     audience_id: int = Field(sa_column=Column(Integer, ForeignKey("audiences.id", ondelete="CASCADE")))
     category: str = Field(index=True)  # e.g., "Hot Discussions", "Advice Requests", etc.
     summary: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default=None, sa_column_kwargs={"server_default": func.timezone("UTC", func.now())})
+    updated_at: datetime = Field(default=None, sa_column_kwargs={"server_default": func.timezone("UTC", func.now())})
     
     # Relationships
     audience: Audience = Relationship(back_populates="themes")
@@ -1,6 +1,7 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import func
 from sqlmodel import Column, Field, ForeignKey, Integer, Relationship, SQLModel
 
 
@@ -9,8 +10,9 @@ class ThemeQuestion(SQLModel, table=True):
     theme_id: int = Field(sa_column=Column(Integer, ForeignKey("theme.id", ondelete="CASCADE"), index=True))
     question: str
     answer: Optional[str] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Naive UTC; the defaults convert now() so they don't depend on the session time zone
+    created_at: datetime = Field(default=None, sa_column_kwargs={"server_default": func.timezone("UTC", func.now())})
+    updated_at: datetime = Field(default=None, sa_column_kwargs={"server_default": func.timezone("UTC", func.now())})
     last_recalculated_at: Optional[datetime] = None
     
     # Relationships
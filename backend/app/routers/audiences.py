@@ -1,88 +1,205 @@
-from datetime import datetime
-from typing import List
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Iterable, List, Set
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.concurrency import run_in_threadpool
-from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
-                                    create_async_engine)
-from sqlalchemy.orm import joinedload
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlmodel import delete, func, select
 
-from ..core.config import get_settings
+from ..core.database import AsyncSessionLocal
 from ..dependencies import get_db_session
 from ..models import (Audience, AudienceSubreddit, RedditPost, Subreddit,
-                      Theme, ThemePost, ThemeQuestion)
+                      ThemePost)
 from ..schemas.audience import (AudienceCreate, AudienceResponse,
                                 AudienceUpdate, AudienceWithSubreddits)
-from ..services.themes import ThemeService
+from ..services.themes import DELETE_AUDIENCE_THEMES_SQL, ThemeService
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/audiences", tags=["audiences"])
 
-# Create a new async session maker for background tasks
-settings = get_settings()
-background_engine = create_async_engine(
-    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
-    echo=True,
-    pool_pre_ping=True
-)
-BackgroundSessionLocal = async_sessionmaker(
-    background_engine,
-    class_=AsyncSession,
-    expire_on_commit=False
+# Deletes an audience with its themes, their posts and questions, and posts
+# from subreddits no other audience uses. Every CTE runs against the same
+# snapshot, so each one selects from audience_subreddits and theme directly.
+_DELETE_AUDIENCE_SQL = text("""
+    WITH del_theme_posts AS (
+        DELETE FROM themepost
+        WHERE theme_id IN (SELECT id FROM theme WHERE audience_id = :audience_id)
+        RETURNING 1
+    ), del_theme_questions AS (
+        DELETE FROM themequestion
+        WHERE theme_id IN (SELECT id FROM theme WHERE audience_id = :audience_id)
+        RETURNING 1
+    ), del_themes AS (
+        DELETE FROM theme
+        WHERE audience_id = :audience_id
+        RETURNING 1
+    ), del_posts AS (
+        DELETE FROM redditpost
+        WHERE subreddit_name IN (
+            SELECT subreddit_name FROM audience_subreddits
+            WHERE audience_id = :audience_id
+            EXCEPT
+            SELECT subreddit_name FROM audience_subreddits
+            WHERE audience_id <> :audience_id
+        )
+        RETURNING 1
+    ), del_audience_subreddits AS (
+        DELETE FROM audience_subreddits
+        WHERE audience_id = :audience_id
+        RETURNING 1
+    )
+    DELETE FROM audiences
+    WHERE id = :audience_id
+    RETURNING id
+""")
+
+# Posts across an audience's subreddits, one correlated count per audience row
+# so the outer query never multiplies audiences by their posts
+_AUDIENCE_POST_COUNT = (
+    select(func.count(RedditPost.id))
+    .join(AudienceSubreddit, AudienceSubreddit.subreddit_name == RedditPost.subreddit_name)
+    .where(AudienceSubreddit.audience_id == Audience.id)
+    .correlate(Audience)
+    .scalar_subquery()
+    .label('post_count')
 )
 
+async def _ensure_subreddits(session: AsyncSession, subreddit_names: List[str]) -> None:
+    """Create any missing subreddits, using the name as the display name."""
+    if not subreddit_names:
+        return
+    # One upsert instead of a get-or-create round-trip per subreddit
+    await session.execute(
+        pg_insert(Subreddit)
+        .values([{"name": name, "display_name": name} for name in subreddit_names])
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+
+async def _add_audience_subreddits(
+    session: AsyncSession,
+    audience_id: int,
+    subreddit_names: List[str]
+) -> None:
+    """Link subreddits to an audience with a single multi-row INSERT."""
+    if not subreddit_names:
+        return
+    await session.execute(
+        insert(AudienceSubreddit),
+        [
+            {"audience_id": audience_id, "subreddit_name": name}
+            for name in subreddit_names
+        ]
+    )
+
+async def _unshared_subreddit_names(
+    session: AsyncSession,
+    audience_id: int,
+    subreddit_names: Iterable[str]
+) -> Set[str]:
+    """Return the given subreddit names that no other audience uses."""
+    candidates = set(subreddit_names)
+    if not candidates:
+        return candidates
+    # One query for every candidate instead of one per subreddit
+    result = await session.execute(
+        select(AudienceSubreddit.subreddit_name)
+        .where(
+            AudienceSubreddit.subreddit_name.in_(candidates),
+            AudienceSubreddit.audience_id != audience_id
+        )
+        .distinct()
+    )
+    shared = {subreddit_name for subreddit_name, in result.all()}
+    return candidates - shared
+
+async def _delete_subreddit_posts(session: AsyncSession, subreddit_names: Set[str]) -> None:
+    """Delete all posts from the given subreddits, and their theme links."""
+    if not subreddit_names:
+        return
+    # Set-based deletes; no ORM objects are loaded, so skip session sync
+    await session.execute(
+        delete(ThemePost)
+        .where(
+            ThemePost.post_id.in_(
+                select(RedditPost.id).where(RedditPost.subreddit_name.in_(subreddit_names))
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(
+        delete(RedditPost)
+        .where(RedditPost.subreddit_name.in_(subreddit_names))
+        .execution_options(synchronize_session=False)
+    )
+
 async def collect_initial_data(audience_id: int) -> None:
     """Background task to collect initial data for a new audience."""
-    async with BackgroundSessionLocal() as session:
+    # Background tasks share the app engine and pool, on a session of their own
+    async with AsyncSessionLocal() as session:
         try:
-            # Get the audience
-            stmt = select(Audience).where(Audience.id == audience_id)
-            result = await session.execute(stmt)
-            audience = result.scalar_one_or_none()
-            
-            if not audience:
-                print(f"Audience {audience_id} not found")
+            # Set collecting flag; no row back means the audience is gone
+            result = await session.execute(
+                update(Audience)
+                .where(Audience.id == audience_id)
+                .values(is_collecting=True)
+                .returning(Audience.id)
+            )
+            if result.first() is None:
+                logger.warning(f"Audience {audience_id} not found")
                 return
+            await session.commit()
             
             try:
-                # Set collecting flag
-                audience.is_collecting = True
-                await session.commit()
-                
                 # Create theme service with the background session
                 theme_service = ThemeService(session)
                 
                 # These methods are already async, so we don't need run_in_threadpool
                 await theme_service.collect_posts_for_audience(audience_id, is_initial_collection=True)
                 await theme_service.analyze_themes(audience_id)
-                
+            except BaseException:
+                # Discard the failed transaction so the reset below can run
+                await session.rollback()
+                raise
             finally:
-                # Always update the collecting status, even if there's an error
-                stmt = select(Audience).where(Audience.id == audience_id)
-                result = await session.execute(stmt)
-                audience = result.scalar_one_or_none()
-                if audience:
-                    audience.is_collecting = False
-                    await session.commit()
+                # Always reset the collecting status, even on error or cancellation
+                await session.execute(
+                    update(Audience)
+                    .where(Audience.id == audience_id)
+                    .values(is_collecting=False)
+                )
+                await session.commit()
                 
         except Exception as e:
-            print(f"Error in collect_initial_data for audience {audience_id}: {str(e)}")
-            # Ensure we reset the collecting flag even if there's an error
-            try:
-                stmt = select(Audience).where(Audience.id == audience_id)
-                result = await session.execute(stmt)
-                audience = result.scalar_one_or_none()
-                if audience:
-                    audience.is_collecting = False
-                    await session.commit()
-            except Exception as inner_e:
-                print(f"Error resetting collecting flag: {str(inner_e)}")
+            logger.error(f"Error in collect_initial_data for audience {audience_id}: {str(e)}")
             raise
 
+# Running initial collections, held so they aren't garbage collected mid-run
+# and can be cancelled when the app shuts down
+_initial_collections: Set[asyncio.Task] = set()
+
+def start_initial_collection(audience_id: int) -> None:
+    """Run collect_initial_data as an app-owned task, detached from the request."""
+    task = asyncio.create_task(collect_initial_data(audience_id))
+    _initial_collections.add(task)
+    task.add_done_callback(_initial_collections.discard)
+
+async def cancel_initial_collections() -> None:
+    """Cancel running initial collections and wait for their cleanup."""
+    for task in _initial_collections:
+        task.cancel()
+    # Cancelled tasks still reset is_collecting in collect_initial_data's finally
+    await asyncio.gather(*_initial_collections, return_exceptions=True)
+
 @router.post("", response_model=AudienceWithSubreddits)
 async def create_audience(
     audience: AudienceCreate,
-    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_db_session)
 ) -> AudienceWithSubreddits:
     """Create a new audience."""
@@ -92,57 +209,31 @@ async def create_audience(
             description=audience.description,
             timeframe=audience.timeframe,
             posts_per_subreddit=audience.posts_per_subreddit,
-            is_collecting=False,  # Start with is_collecting=False
+            is_collecting=True,  # Initial collection starts once this is committed
             collection_progress=0.0
         )
         
         # Add subreddits to the audience
-        subreddit_names = []
-        for subreddit_name in audience.subreddit_names:
-            subreddit_name = subreddit_name.lower()
-            subreddit_names.append(subreddit_name)
-            
-            # Get or create subreddit
-            stmt = select(Subreddit).where(Subreddit.name == subreddit_name)
-            result = await session.execute(stmt)
-            db_subreddit = result.scalar_one_or_none()
-            
-            if not db_subreddit:
-                db_subreddit = Subreddit(
-                    name=subreddit_name,
-                    display_name=subreddit_name
-                )
-                session.add(db_subreddit)
-                try:
-                    await session.flush()
-                except Exception as e:
-                    await session.rollback()
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Error creating subreddit {subreddit_name}: {str(e)}"
-                    )
-            
-            audience_subreddit = AudienceSubreddit(subreddit_name=subreddit_name)
-            db_audience.subreddits.append(audience_subreddit)
+        subreddit_names = [name.lower() for name in audience.subreddit_names]
+        try:
+            await _ensure_subreddits(session, subreddit_names)
+        except Exception as e:
+            await session.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=f"Error creating subreddits: {str(e)}"
+            )
         
         session.add(db_audience)
+        # Flush for the audience id, then link its subreddits in one INSERT;
+        # the flush's RETURNING also loads the server-default timestamps
+        await session.flush()
+        await _add_audience_subreddits(session, db_audience.id, subreddit_names)
         await session.commit()
         
-        # Refresh the audience with eager loading of subreddits
-        stmt = (
-            select(Audience)
-            .options(joinedload(Audience.subreddits))
-            .where(Audience.id == db_audience.id)
-        )
-        result = await session.execute(stmt)
-        db_audience = result.unique().scalar_one()
-        
-        # Start background task after successful commit
-        background_tasks.add_task(collect_initial_data, db_audience.id)
-        
-        # Update is_collecting to True after adding background task
-        db_audience.is_collecting = True
-        await session.commit()
+        # Start collection once committed; the response is built from the
+        # instance and the known names, with no refresh query
+        start_initial_collection(db_audience.id)
         
         return AudienceWithSubreddits(
             id=db_audience.id,
@@ -166,25 +257,20 @@ async def create_audience(
 @router.get("", response_model=List[AudienceWithSubreddits])
 async def get_audiences(
     session: AsyncSession = Depends(get_db_session)
-) -> List[AudienceWithSubreddits]:
+) -> ORJSONResponse:
     """Get all audiences."""
     # Query audiences with their post counts and eagerly load subreddits
     stmt = (
-        select(
-            Audience,
-            func.count(RedditPost.id).label('post_count')
-        )
-        .outerjoin(AudienceSubreddit, Audience.id == AudienceSubreddit.audience_id)
-        .outerjoin(RedditPost, AudienceSubreddit.subreddit_name == RedditPost.subreddit_name)
-        .options(joinedload(Audience.subreddits))
-        .group_by(Audience.id)
+        select(Audience, _AUDIENCE_POST_COUNT)
+        .options(selectinload(Audience.subreddits))
         .order_by(Audience.created_at.desc())  # Sort by creation date, newest first
     )
     
     result = await session.execute(stmt)
-    audiences_with_counts = result.unique().all()
+    audiences_with_counts = result.all()
     
-    return [
+    # Already shaped; hand straight to orjson so FastAPI skips re-validating
+    return ORJSONResponse([
         AudienceWithSubreddits(
             id=audience.id,
             name=audience.name,
@@ -196,36 +282,30 @@ async def get_audiences(
             is_collecting=audience.is_collecting,
             post_count=post_count or 0,
             subreddit_names=[s.subreddit_name for s in audience.subreddits]
-        )
+        ).model_dump()
         for audience, post_count in audiences_with_counts
-    ]
+    ])
 
 @router.get("/{audience_id}", response_model=AudienceWithSubreddits)
 async def get_audience(
     audience_id: int,
     session: AsyncSession = Depends(get_db_session)
-) -> AudienceWithSubreddits:
+) -> ORJSONResponse:
     """Get an audience by ID with its subreddits."""
     stmt = (
-        select(
-            Audience,
-            func.count(RedditPost.id).label('post_count')
-        )
-        .outerjoin(AudienceSubreddit, Audience.id == AudienceSubreddit.audience_id)
-        .outerjoin(RedditPost, AudienceSubreddit.subreddit_name == RedditPost.subreddit_name)
-        .options(joinedload(Audience.subreddits))
+        select(Audience, _AUDIENCE_POST_COUNT)
+        .options(selectinload(Audience.subreddits))
         .where(Audience.id == audience_id)
-        .group_by(Audience.id)
     )
     
     result = await session.execute(stmt)
-    result = result.unique().first()
+    result = result.first()
     
     if not result:
         raise HTTPException(status_code=404, detail="Audience not found")
     
     audience, post_count = result
-    return AudienceWithSubreddits(
+    return ORJSONResponse(AudienceWithSubreddits(
         id=audience.id,
         name=audience.name,
         description=audience.description,
@@ -236,7 +316,7 @@ async def get_audience(
         is_collecting=audience.is_collecting,
         post_count=post_count or 0,
         subreddit_names=[s.subreddit_name for s in audience.subreddits]
-    )
+    ).model_dump())
 
 @router.patch("/{audience_id}", response_model=AudienceWithSubreddits)
 async def update_audience(
@@ -248,11 +328,11 @@ async def update_audience(
     # Load audience with subreddits in a single query
     stmt = (
         select(Audience)
-        .options(joinedload(Audience.subreddits))
+        .options(selectinload(Audience.subreddits))
         .where(Audience.id == audience_id)
     )
     result = await session.execute(stmt)
-    audience = result.unique().scalar_one_or_none()
+    audience = result.scalar_one_or_none()
     
     if not audience:
         raise HTTPException(status_code=404, detail="Audience not found")
@@ -280,58 +360,12 @@ async def update_audience(
         # Delete posts from removed subreddits
         if removed_subreddit_names:
             try:
-                # For each removed subreddit, check if it's used by other audiences
-                for subreddit_name in removed_subreddit_names:
-                    # Check if subreddit is used by other audiences
-                    result = await session.execute(
-                        select(AudienceSubreddit)
-                        .where(
-                            (AudienceSubreddit.subreddit_name == subreddit_name) &
-                            (AudienceSubreddit.audience_id != audience_id)
-                        )
-                    )
-                    other_audience_uses = result.first() is not None
-                    
-                    # Only delete posts if subreddit is not used by other audiences
-                    if not other_audience_uses:
-                        # Get posts from this subreddit
-                        result = await session.execute(
-                            select(RedditPost.id).where(RedditPost.subreddit_name == subreddit_name)
-                        )
-                        post_ids = [post_id for post_id, in result.all()]
-                        
-                        if post_ids:
-                            # Delete theme_posts entries that reference these posts
-                            await session.execute(
-                                delete(ThemePost).where(ThemePost.post_id.in_(post_ids))
-                            )
-                            
-                            # Then delete the posts themselves
-                            await session.execute(
-                                delete(RedditPost).where(RedditPost.id.in_(post_ids))
-                            )
-                
-                # Get all theme IDs for this audience
-                result = await session.execute(
-                    select(Theme.id).where(Theme.audience_id == audience_id)
-                )
-                theme_ids = [theme_id for theme_id, in result.all()]
+                # Only delete posts from subreddits no other audience uses
+                deletable = await _unshared_subreddit_names(session, audience_id, removed_subreddit_names)
+                await _delete_subreddit_posts(session, deletable)
                 
-                if theme_ids:
-                    # First delete theme questions
-                    await session.execute(
-                        delete(ThemeQuestion).where(ThemeQuestion.theme_id.in_(theme_ids))
-                    )
-                    
-                    # Then delete theme posts
-                    await session.execute(
-                        delete(ThemePost).where(ThemePost.theme_id.in_(theme_ids))
-                    )
-                    
-                    # Finally delete the themes
-                    await session.execute(
-                        delete(Theme).where(Theme.id.in_(theme_ids))
-                    )
+                # Delete the audience's themes with their questions and posts
+                await session.execute(DELETE_AUDIENCE_THEMES_SQL, {"audience_id": audience_id})
                 
                 # Commit the deletions
                 await session.commit()
@@ -347,47 +381,20 @@ async def update_audience(
             delete(AudienceSubreddit).where(AudienceSubreddit.audience_id == audience_id)
         )
         
-        # Add new subreddits
-        for subreddit_name in update.subreddit_names:
-            # Ensure subreddit name is lowercase
-            subreddit_name = subreddit_name.lower()
-            
-            # Get or create subreddit
-            result = await session.execute(
-                select(Subreddit).where(Subreddit.name == subreddit_name)
-            )
-            db_subreddit = result.scalar_one_or_none()
-            
-            if not db_subreddit:
-                # Create a new subreddit with minimal information
-                db_subreddit = Subreddit(
-                    name=subreddit_name,
-                    display_name=subreddit_name  # Use name as display_name initially
-                )
-                session.add(db_subreddit)
-                await session.flush()
-            
-            audience_subreddit = AudienceSubreddit(
-                audience_id=audience_id,
-                subreddit_name=subreddit_name
-            )
-            session.add(audience_subreddit)
+        # Add new subreddits, creating any that don't exist yet
+        subreddit_names = [name.lower() for name in update.subreddit_names]
+        await _ensure_subreddits(session, subreddit_names)
+        await _add_audience_subreddits(session, audience_id, subreddit_names)
+    else:
+        subreddit_names = [s.subreddit_name for s in audience.subreddits]
     
-    # Update the timestamp
-    audience.updated_at = datetime.utcnow()
+    # Update the timestamp; the column is timestamptz, so keep it aware
+    audience.updated_at = datetime.now(timezone.utc)
     
-    # Commit the changes
+    # Commit the changes; expire_on_commit is off, so the instance already
+    # holds every value written and needs no re-select
     await session.commit()
     
-    # Refresh audience with subreddits
-    stmt = (
-        select(Audience)
-        .options(joinedload(Audience.subreddits))
-        .where(Audience.id == audience_id)
-    )
-    result = await session.execute(stmt)
-    audience = result.unique().scalar_one_or_none()
-    
     return AudienceWithSubreddits(
         id=audience.id,
         name=audience.name,
@@ -398,7 +405,7 @@ async def update_audience(
         posts_per_subreddit=audience.posts_per_subreddit,
         is_collecting=audience.is_collecting,
         collection_progress=audience.collection_progress,
-        subreddit_names=[s.subreddit_name for s in audience.subreddits]
+        subreddit_names=subreddit_names
     )
 
 @router.delete("/{audience_id}")
@@ -410,79 +417,11 @@ async def delete_audience(
     try:
         # Start a transaction
         async with session.begin():
-            # Get the audience with its subreddits
-            result = await session.execute(
-                select(Audience)
-                .options(joinedload(Audience.subreddits))
-                .where(Audience.id == audience_id)
-            )
-            audience = result.unique().scalar_one_or_none()
-            
-            if not audience:
+            # Delete the audience and everything hanging off it in one round-trip
+            result = await session.execute(_DELETE_AUDIENCE_SQL, {"audience_id": audience_id})
+            if result.first() is None:
                 raise HTTPException(status_code=404, detail="Audience not found")
             
-            # Get all subreddit names for this audience
-            subreddit_names = [s.subreddit_name for s in audience.subreddits]
-            
-            # Step 1: Delete all theme-related data
-            # First get all theme IDs for this audience
-            result = await session.execute(
-                select(Theme.id).where(Theme.audience_id == audience_id)
-            )
-            theme_ids = [theme_id for theme_id, in result.all()]
-            
-            if theme_ids:
-                # Delete theme_posts and theme_questions first (they reference themes)
-                await session.execute(
-                    delete(ThemePost).where(ThemePost.theme_id.in_(theme_ids))
-                )
-                await session.execute(
-                    delete(ThemeQuestion).where(ThemeQuestion.theme_id.in_(theme_ids))
-                )
-                # Then delete the themes
-                await session.execute(
-                    delete(Theme).where(Theme.id.in_(theme_ids))
-                )
-            
-            # Step 2: For each subreddit, check if we should delete its posts
-            for subreddit_name in subreddit_names:
-                # Check if subreddit is used by other audiences
-                result = await session.execute(
-                    select(AudienceSubreddit)
-                    .where(
-                        (AudienceSubreddit.subreddit_name == subreddit_name) &
-                        (AudienceSubreddit.audience_id != audience_id)
-                    )
-                )
-                other_audience_uses = result.first() is not None
-                
-                # Only delete posts if subreddit is not used by other audiences
-                if not other_audience_uses:
-                    # Get posts from this subreddit
-                    result = await session.execute(
-                        select(RedditPost.id).where(RedditPost.subreddit_name == subreddit_name)
-                    )
-                    post_ids = [post_id for post_id, in result.all()]
-                    
-                    if post_ids:
-                        # Delete theme_posts entries that reference these posts first
-                        await session.execute(
-                            delete(ThemePost).where(ThemePost.post_id.in_(post_ids))
-                        )
-                        # Then delete the posts themselves
-                        await session.execute(
-                            delete(RedditPost).where(RedditPost.id.in_(post_ids))
-                        )
-            
-            # Step 3: Delete audience_subreddits associations
-            # This needs to happen before deleting the audience due to foreign key constraints
-            await session.execute(
-                delete(AudienceSubreddit).where(AudienceSubreddit.audience_id == audience_id)
-            )
-            
-            # Step 4: Finally delete the audience itself
-            await session.delete(audience)
-            
             # The transaction will be automatically committed here if no errors occurred
             
         return {"status": "success", "message": "Audience deleted successfully"}
@@ -1,10 +1,14 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.encoders import jsonable_encoder
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.cache import get_cache
+from ..core.database import AsyncSessionLocal
 from ..dependencies import get_db_session, get_reddit_service
 from ..models import Subreddit
 from ..schemas.subreddit import KeywordSuggestionResponse, SubredditResponse
@@ -13,25 +17,54 @@ from ..services.reddit import RedditService
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/subreddits", tags=["subreddits"])
 
+# Seconds a serialized subreddit info response is kept
+SUBREDDIT_INFO_CACHE_TTL = 300
+
+# Seconds serialized trending and keyword suggestion responses are kept
+TRENDING_CACHE_TTL = 60
+
+# Serializes a list of validated SubredditResponse models straight to JSON
+_SUBREDDIT_LIST_ADAPTER = TypeAdapter(List[SubredditResponse])
+
+# SubredditResponse's fields, read straight off Subreddit rows
+_SUBREDDIT_RESPONSE_FIELDS = tuple(SubredditResponse.model_fields)
+
+
+def _subreddit_payload(subreddit: Subreddit) -> dict:
+    """Shape a Subreddit row like SubredditResponse without building a model."""
+    values = subreddit.__dict__
+    return {field: values.get(field) for field in _SUBREDDIT_RESPONSE_FIELDS}
+
+
+async def _sync_subreddits(reddit_service: RedditService, subreddits: list) -> None:
+    """Background task: upsert listed subreddits on a session of its own."""
+    try:
+        async with AsyncSessionLocal() as session:
+            await reddit_service.bulk_sync_subreddits(subreddits, session)
+    except Exception as e:
+        logger.error(f"Error syncing subreddits to database: {str(e)}")
+
+
 @router.get("/trending", response_model=List[SubredditResponse])
 async def get_trending_subreddits(
+    background_tasks: BackgroundTasks,
     limit: int = 20,
-    reddit_service: RedditService = Depends(get_reddit_service),
-    session: AsyncSession = Depends(get_db_session)
-) -> List[SubredditResponse]:
+    reddit_service: RedditService = Depends(get_reddit_service)
+) -> Response:
     """Get trending subreddits."""
     try:
+        # Hits skip both the Reddit call and the database sync
+        cache = get_cache()
+        cache_key = f"trending_subreddits:{limit}"
+        body = await cache.get(cache_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+        
         logger.info("Fetching trending subreddits")
         subreddits = await reddit_service.get_trending_subreddits(limit=limit)
         
-        # Sync each subreddit to the database
-        for subreddit in subreddits:
-            try:
-                await reddit_service.sync_subreddit_to_db(subreddit, session)
-            except Exception as e:
-                logger.error(f"Error syncing subreddit to database: {str(e)}")
-                # Continue with other subreddits even if one fails
-                continue
+        # The response is built from the fetched rows, so sync after sending it
+        background_tasks.add_task(_sync_subreddits, reddit_service, subreddits)
         
         # Convert models to response schema using model_validate
         responses = []
@@ -42,8 +75,12 @@ async def get_trending_subreddits(
             except Exception as e:
                 logger.error(f"Error serializing subreddit {subreddit.name}: {str(e)}")
                 continue
-                
-        return responses
+        
+        # Encode the validated models in one pydantic-core pass, with no
+        # intermediate dicts and no re-validation by FastAPI
+        body = _SUBREDDIT_LIST_ADAPTER.dump_json(responses)
+        await cache.set(cache_key, body, expire=TRENDING_CACHE_TTL)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         logger.error(f"Error in get_trending_subreddits: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch trending subreddits: {str(e)}")
@@ -51,14 +88,14 @@ async def get_trending_subreddits(
 @router.get("/search", response_model=List[SubredditResponse])
 async def search_subreddits(
     query: str,
+    background_tasks: BackgroundTasks,
     limit: int = 100,
     min_subscribers: Optional[int] = None,
     max_subscribers: Optional[int] = None,
     min_active_users: Optional[int] = None,
     max_active_users: Optional[int] = None,
-    reddit_service: RedditService = Depends(get_reddit_service),
-    session: AsyncSession = Depends(get_db_session)
-) -> List[SubredditResponse]:
+    reddit_service: RedditService = Depends(get_reddit_service)
+) -> ORJSONResponse:
     """Search for subreddits."""
     try:
         logger.info(f"Searching subreddits with query: {query}, filters: min_subscribers={min_subscribers}, max_subscribers={max_subscribers}, min_active_users={min_active_users}, max_active_users={max_active_users}")
@@ -71,26 +108,12 @@ async def search_subreddits(
             max_active_users=max_active_users
         )
         
-        # Sync each subreddit to the database
-        for subreddit in subreddits:
-            try:
-                await reddit_service.sync_subreddit_to_db(subreddit, session)
-            except Exception as e:
-                logger.error(f"Error syncing subreddit to database: {str(e)}")
-                continue
+        # The response is built from the fetched rows, so sync after sending it
+        background_tasks.add_task(_sync_subreddits, reddit_service, subreddits)
         
-        # Convert models to response schema and ensure proper JSON serialization
-        responses = []
-        for subreddit in subreddits:
-            try:
-                json_data = jsonable_encoder(subreddit)
-                response = SubredditResponse(**json_data)
-                responses.append(response)
-            except Exception as e:
-                logger.error(f"Error serializing subreddit {subreddit.name}: {str(e)}")
-                continue
-                
-        return responses
+        # Shape the service-built rows as plain dicts; orjson encodes them
+        # without any pydantic model in between
+        return ORJSONResponse([_subreddit_payload(subreddit) for subreddit in subreddits])
     except Exception as e:
         logger.error(f"Error in search_subreddits: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to search subreddits: {str(e)}")
@@ -100,12 +123,20 @@ async def get_keyword_suggestions(
     query: str,
     limit: int = 5,
     reddit_service: RedditService = Depends(get_reddit_service)
-) -> List[KeywordSuggestionResponse]:
+) -> Response:
     """Get keyword suggestions based on a partial search query."""
     try:
+        cache = get_cache()
+        cache_key = f"keyword_suggestions:{query.lower()}:{limit}"
+        body = await cache.get(cache_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+        
         logger.info(f"Getting keyword suggestions for query: {query}")
         suggestions = await reddit_service.get_keyword_suggestions(query, limit=limit)
-        return suggestions
+        body = orjson.dumps([suggestion.model_dump() for suggestion in suggestions])
+        await cache.set(cache_key, body, expire=TRENDING_CACHE_TTL)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         logger.error(f"Error in get_keyword_suggestions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get keyword suggestions: {str(e)}")
@@ -115,9 +146,16 @@ async def get_subreddit_info(
     subreddit_name: str,
     reddit_service: RedditService = Depends(get_reddit_service),
     session: AsyncSession = Depends(get_db_session)
-) -> SubredditResponse:
+) -> Response:
     """Get information about a specific subreddit."""
     try:
+        # Hits return the encoded bytes without calling Reddit or the database
+        cache = get_cache()
+        cache_key = f"subreddit_info:{subreddit_name.lower()}"
+        body = await cache.get(cache_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+        
         logger.info(f"Getting info for subreddit: {subreddit_name}")
         subreddit = await reddit_service.get_subreddit_info(subreddit_name)
         
@@ -127,10 +165,10 @@ async def get_subreddit_info(
         except Exception as e:
             logger.error(f"Error syncing subreddit to database: {str(e)}")
         
-        # Convert model to response schema and ensure proper JSON serialization
-        json_data = jsonable_encoder(subreddit)
-        response = SubredditResponse(**json_data)
-        return response
+        # Shape the service-built row as a plain dict and cache its encoding
+        body = orjson.dumps(_subreddit_payload(subreddit))
+        await cache.set(cache_key, body, expire=SUBREDDIT_INFO_CACHE_TTL)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         logger.error(f"Error in get_subreddit_info: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get subreddit info: {str(e)}") 
\ No newline at end of file
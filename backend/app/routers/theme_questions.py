@@ -1,79 +1,99 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List
 
 from app.core.database import get_session
-from app.models import Comment, Theme, ThemePost, ThemeQuestion
+from app.models import Comment, RedditPost, Theme, ThemePost, ThemeQuestion
 from app.schemas.theme_question import ThemeQuestion as ThemeQuestionSchema
 from app.schemas.theme_question import ThemeQuestionCreate
 from app.services.openai_service import (analyze_posts_for_answer,
                                          analyze_theme_content)
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
-from sqlmodel import select
+from sqlmodel import func, select
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/theme-questions", tags=["theme-questions"])
 
+# Most relevant posts, and top comments per post, given to the answer model
+QUESTION_POST_LIMIT = 20
+QUESTION_COMMENTS_PER_POST = 10
+
+# Post and comment fields handed to the OpenAI analysis helpers
+_QUESTION_POST_COLUMNS = (
+    RedditPost.id,
+    RedditPost.title,
+    RedditPost.content,
+    RedditPost.score,
+    RedditPost.num_comments,
+    RedditPost.engagement_score,
+)
+_QUESTION_COMMENT_COLUMNS = (
+    Comment.id,
+    Comment.post_id,
+    Comment.content,
+    Comment.score,
+    Comment.engagement_score,
+    Comment.is_submitter,
+    Comment.depth,
+)
+
+# ThemeQuestionSchema's fields, selected straight from the themequestion table
+_QUESTION_RESPONSE_COLUMNS = tuple(
+    getattr(ThemeQuestion, field) for field in ThemeQuestionSchema.model_fields
+)
+
 @router.post("/", response_model=ThemeQuestionSchema)
 async def create_theme_question(
     question: ThemeQuestionCreate,
     db: AsyncSession = Depends(get_session)
 ) -> ThemeQuestion:
     try:
-        # Check if theme exists with eager loading of theme_posts, posts, and comments
+        # Check if theme exists
+        result = await db.execute(select(Theme.id).where(Theme.id == question.theme_id))
+        if result.first() is None:
+            raise HTTPException(status_code=404, detail="Theme not found")
+
+        # Rank and limit in SQL so only the rows used are fetched: the most
+        # relevant posts, then the top comments of each by engagement
         result = await db.execute(
-            select(Theme)
-            .options(
-                joinedload(Theme.theme_posts)
-                .joinedload(ThemePost.post)
-                .joinedload(RedditPost.comments)
+            select(*_QUESTION_POST_COLUMNS, ThemePost.relevance_score)
+            .join(RedditPost, RedditPost.id == ThemePost.post_id)
+            .where(ThemePost.theme_id == question.theme_id)
+            .order_by(ThemePost.relevance_score.desc().nulls_last())
+            .limit(QUESTION_POST_LIMIT)
+        )
+        posts = [dict(row) for row in result.mappings()]
+
+        ranked_comments = (
+            select(
+                *_QUESTION_COMMENT_COLUMNS,
+                func.row_number().over(
+                    partition_by=Comment.post_id,
+                    order_by=Comment.engagement_score.desc().nulls_last()
+                ).label("rank")
             )
-            .where(Theme.id == question.theme_id)
+            .where(Comment.post_id.in_([post["id"] for post in posts]))
+            .subquery()
         )
-        theme = result.unique().scalar_one_or_none()
-        if not theme:
-            raise HTTPException(status_code=404, detail="Theme not found")
+        result = await db.execute(
+            select(ranked_comments)
+            .where(ranked_comments.c.rank <= QUESTION_COMMENTS_PER_POST)
+            .order_by(ranked_comments.c.post_id, ranked_comments.c.rank)
+        )
+        comments_by_post = {}
+        for row in result.mappings():
+            comment = dict(row)
+            del comment["rank"]
+            comments_by_post.setdefault(comment["post_id"], []).append(comment)
 
-        # Convert posts and comments to dictionaries
-        posts = []
-        comments = []
-        for theme_post in sorted(
-            theme.theme_posts,
-            key=lambda x: x.relevance_score,
-            reverse=True
-        )[:20]:  # Limit to 20 most relevant posts
-            post = theme_post.post
-            post_dict = {
-                "id": post.id,
-                "title": post.title,
-                "content": post.content,
-                "score": post.score,
-                "num_comments": post.num_comments,
-                "engagement_score": post.engagement_score,
-                "relevance_score": theme_post.relevance_score
-            }
-            posts.append(post_dict)
-            
-            # Add comments for this post
-            post_comments = sorted(
-                post.comments,
-                key=lambda x: x.engagement_score,
-                reverse=True
-            )[:10]  # Take top 10 comments per post
-            
-            for comment in post_comments:
-                comment_dict = {
-                    "id": comment.id,
-                    "post_id": post.id,
-                    "content": comment.content,
-                    "score": comment.score,
-                    "engagement_score": comment.engagement_score,
-                    "is_submitter": comment.is_submitter,
-                    "depth": comment.depth
-                }
-                comments.append(comment_dict)
+        # Keep comments grouped in post relevance order
+        comments = [
+            comment
+            for post in posts
+            for comment in comments_by_post.get(post["id"], [])
+        ]
 
         # Generate answer using enhanced analysis
         try:
@@ -95,12 +115,15 @@ async def create_theme_question(
                 detail="Failed to generate answer. Please try again later."
             )
 
-        # Create and save the theme question
+        # Create and save the theme question; both timestamps share one
+        # instant, stored as naive UTC like the columns' server defaults
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
         theme_question = ThemeQuestion(
             theme_id=question.theme_id,
             question=question.question,
             answer=answer,
-            created_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         db.add(theme_question)
         await db.commit()
@@ -118,16 +141,17 @@ async def create_theme_question(
 async def get_theme_questions(
     theme_id: int,
     db: AsyncSession = Depends(get_session)
-) -> List[ThemeQuestion]:
+) -> ORJSONResponse:
     """Get all questions for a theme."""
     try:
+        # Select the response fields as columns and hand the rows to orjson;
+        # no ORM objects are built and FastAPI skips re-validating them
         result = await db.execute(
-            select(ThemeQuestion)
+            select(*_QUESTION_RESPONSE_COLUMNS)
             .where(ThemeQuestion.theme_id == theme_id)
             .order_by(ThemeQuestion.created_at.desc())
         )
-        questions = result.scalars().all()
-        return questions
+        return ORJSONResponse([dict(row) for row in result.mappings()])
     except Exception as e:
         logger.error(f"Error getting theme questions: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -139,51 +163,34 @@ async def analyze_theme(
 ) -> dict:
     """Generate an AI-powered analysis of a theme's content."""
     try:
-        # Get theme with posts and comments
+        # Get theme category
+        result = await db.execute(select(Theme.category).where(Theme.id == theme_id))
+        category = result.scalar_one_or_none()
+        if category is None:
+            raise HTTPException(status_code=404, detail="Theme not found")
+
+        # Fetch only the columns analyzed, as row mappings; no ORM objects are
+        # built and each row becomes its dict in one step
         result = await db.execute(
-            select(Theme)
-            .options(
-                joinedload(Theme.theme_posts)
-                .joinedload(ThemePost.post)
-                .joinedload(RedditPost.comments)
-            )
-            .where(Theme.id == theme_id)
+            select(*_QUESTION_POST_COLUMNS, ThemePost.relevance_score)
+            .join(RedditPost, RedditPost.id == ThemePost.post_id)
+            .where(ThemePost.theme_id == theme_id)
         )
-        theme = result.unique().scalar_one_or_none()
-        if not theme:
-            raise HTTPException(status_code=404, detail="Theme not found")
+        posts = [dict(row) for row in result.mappings()]
 
-        # Prepare posts and comments data
-        posts = []
-        comments = []
-        for theme_post in theme.theme_posts:
-            post = theme_post.post
-            posts.append({
-                "id": post.id,
-                "title": post.title,
-                "content": post.content,
-                "score": post.score,
-                "num_comments": post.num_comments,
-                "engagement_score": post.engagement_score,
-                "relevance_score": theme_post.relevance_score
-            })
-            
-            for comment in post.comments:
-                comments.append({
-                    "id": comment.id,
-                    "post_id": post.id,
-                    "content": comment.content,
-                    "score": comment.score,
-                    "engagement_score": comment.engagement_score,
-                    "is_submitter": comment.is_submitter,
-                    "depth": comment.depth
-                })
+        result = await db.execute(
+            select(*_QUESTION_COMMENT_COLUMNS)
+            .join(ThemePost, ThemePost.post_id == Comment.post_id)
+            .where(ThemePost.theme_id == theme_id)
+            .order_by(Comment.post_id)
+        )
+        comments = [dict(row) for row in result.mappings()]
 
         # Generate theme analysis
         analysis = await analyze_theme_content(
             theme_posts=posts,
             theme_comments=comments,
-            category=theme.category
+            category=category
         )
         
         return analysis
@@ -1,20 +1,44 @@
+import logging
 from datetime import datetime
 from typing import List
 
+import orjson
+from app.core.cache import get_cache
 from app.dependencies import get_db_session
-from app.models import Audience, Theme, ThemePost, ThemeQuestion
+from app.models import Audience, Theme, ThemeQuestion
 from app.schemas.theme import ThemeResponse
-from app.services.themes import ThemeService
+from app.services.themes import DELETE_AUDIENCE_THEMES_SQL, ThemeService
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import text
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import func, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import delete, select
+from sqlmodel import select
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/api/themes",
     tags=["themes"]
 )
 
+# Seconds a serialized theme list is kept; entries are also keyed on the
+# audience's newest theme, so a refresh is picked up immediately
+THEMES_CACHE_TTL = 300
+
+# ThemeResponse's fields, read straight off Theme rows
+_THEME_RESPONSE_FIELDS = tuple(ThemeResponse.model_fields)
+
+def _themes_payload(themes: List[Theme]) -> List[dict]:
+    """Shape theme rows like ThemeResponse without building models."""
+    return [
+        {field: theme.__dict__.get(field) for field in _THEME_RESPONSE_FIELDS}
+        for theme in themes
+    ]
+
+def _themes_response(themes: List[Theme]) -> ORJSONResponse:
+    """Serialize theme rows straight from the database without building models."""
+    return ORJSONResponse(_themes_payload(themes))
+
 @router.get("/audience/{audience_id}", response_model=List[ThemeResponse])
 async def get_audience_themes(
     audience_id: int,
@@ -34,6 +58,19 @@ async def get_audience_themes(
                 detail="Initial data collection is in progress. Please wait."
             )
         
+        # Refreshing replaces the themes with new rows, so the newest id and
+        # updated_at identify the current set
+        result = await db.execute(
+            select(func.max(Theme.id), func.max(Theme.updated_at))
+            .where(Theme.audience_id == audience_id)
+        )
+        newest_id, newest_updated_at = result.one()
+        cache = get_cache()
+        cache_key = f"themes:{audience_id}:{newest_id}:{newest_updated_at}"
+        body = await cache.get(cache_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+        
         # Get existing themes from database
         result = await db.execute(select(Theme).where(Theme.audience_id == audience_id))
         themes = result.scalars().all()
@@ -44,7 +81,10 @@ async def get_audience_themes(
                 detail="No themes found. Initial data collection may have failed. Please try refreshing themes."
             )
         
-        return themes
+        # Cache the encoded bytes so hits skip the ORM and serialization
+        body = orjson.dumps(_themes_payload(themes))
+        await cache.set(cache_key, body, expire=THEMES_CACHE_TTL)
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
@@ -70,23 +110,15 @@ async def request_theme_refresh(
                 detail="Initial data collection is in progress. Please wait."
             )
         
-        # Get old theme IDs
-        result = await db.execute(
-            select(Theme.id).where(Theme.audience_id == audience_id)
-        )
-        old_theme_ids = [theme_id for theme_id, in result.all()]
-        
         # Delete old themes and their associations
-        if old_theme_ids:
-            await db.execute(delete(ThemePost).where(ThemePost.theme_id.in_(old_theme_ids)))
-            await db.execute(delete(Theme).where(Theme.id.in_(old_theme_ids)))
-            await db.commit()
+        await db.execute(DELETE_AUDIENCE_THEMES_SQL, {"audience_id": audience_id})
+        await db.commit()
         
         # Create new themes
         theme_service = ThemeService(db)
         try:
             new_themes = await theme_service.analyze_themes(audience_id)
-            return new_themes
+            return _themes_response(new_themes)
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
         except Exception as e:
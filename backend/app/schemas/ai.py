@@ -2,7 +2,7 @@
 
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Source(BaseModel):
@@ -12,10 +12,14 @@ class Source(BaseModel):
     url: Optional[str] = None
     relevance: Optional[float] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class AIResponse(BaseModel):
     """Response from AI analysis."""
     answer: str
     sources: List[Source]
     confidence: Optional[float] = None
-    metadata: Optional[dict] = None 
\ No newline at end of file
+    metadata: Optional[dict] = None
+
+    model_config = ConfigDict(defer_build=True)
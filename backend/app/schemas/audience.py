@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AudienceBase(BaseModel):
@@ -13,6 +13,8 @@ class AudienceBase(BaseModel):
         pattern="^(hour|day|week|month|year|all)$"
     )
 
+    model_config = ConfigDict(defer_build=True)
+
 class AudienceCreate(AudienceBase):
     subreddit_names: List[str]
     posts_per_subreddit: int = 300  # Default to 300 posts per subreddit
@@ -27,6 +29,8 @@ class AudienceUpdate(BaseModel):
     )
     posts_per_subreddit: Optional[int] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 class AudienceResponse(AudienceBase):
     id: int
     created_at: datetime
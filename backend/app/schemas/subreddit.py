@@ -17,12 +17,7 @@ class SubredditResponse(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    model_config = ConfigDict(
-        from_attributes=True,
-        json_encoders={
-            datetime: lambda dt: dt.isoformat() if dt else None
-        }
-    )
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class KeywordSuggestionResponse(BaseModel):
@@ -30,5 +25,4 @@ class KeywordSuggestionResponse(BaseModel):
     score: float  # Relevance score
     subreddit_count: Optional[int] = None  # Number of subreddits matching this keyword
 
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
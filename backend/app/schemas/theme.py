@@ -1,13 +1,15 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class ThemeBase(BaseModel):
     category: str
     summary: str
 
+    model_config = ConfigDict(defer_build=True)
+
 class ThemeCreate(ThemeBase):
     audience_id: int
 
@@ -15,14 +17,15 @@ class ThemeUpdate(BaseModel):
     category: Optional[str] = None
     summary: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 class ThemeResponse(ThemeBase):
     id: int
     audience_id: int
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ThemeWithPosts(ThemeResponse):
     posts: List[dict]  # List of posts with relevance scores 
\ No newline at end of file
@@ -1,12 +1,14 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class ThemeQuestionBase(BaseModel):
     question: str
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class ThemeQuestionCreate(ThemeQuestionBase):
     theme_id: int
@@ -25,5 +27,4 @@ class ThemeQuestion(ThemeQuestionBase):
     updated_at: datetime
     last_recalculated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
@@ -6,7 +6,6 @@ from typing import Dict, List, Optional
 
 from app.core.config import get_settings
 from app.models.audience import Audience
-from app.models.post_analysis import PostAnalysis
 from app.models.reddit_post import RedditPost
 from app.models.theme import Theme, ThemePost
 from app.models.theme_question import ThemeQuestion
@@ -38,14 +37,10 @@ class AIService:
             if not posts:
                 raise ValueError("No relevant posts found for analysis")
             
-            # 2. Get post analyses for context
-            post_ids = [post.id for post in posts]
-            analyses = await self._get_post_analyses(post_ids)
+            # 2. Prepare context for AI; theme analysis is stored on the posts
+            context = self._prepare_context(posts)
             
-            # 3. Prepare context for AI
-            context = self._prepare_context(posts, analyses)
-            
-            # 4. Get AI response using OpenAI service
+            # 3. Get AI response using OpenAI service
             response_dict = await analyze_posts_for_answer(
                 question=question,
                 posts=[{
@@ -57,7 +52,7 @@ class AIService:
                 } for post in posts]
             )
             
-            # 5. Convert to AIResponse schema
+            # 4. Convert to AIResponse schema
             sources = [
                 Source(
                     title=post.title,
@@ -74,7 +69,7 @@ class AIService:
                 metadata={"analyzed_at": datetime.utcnow().isoformat()}
             )
             
-            # 6. Save question if theme-specific
+            # 5. Save question if theme-specific
             if theme_id:
                 await self._save_theme_question(question, response, theme_id)
             
@@ -120,26 +115,8 @@ class AIService:
             logger.error(f"Error getting relevant posts: {e}")
             return []
     
-    async def _get_post_analyses(self, post_ids: List[int]) -> List[PostAnalysis]:
-        """Get post analyses for a list of posts."""
-        try:
-            result = await self.db.execute(
-                select(PostAnalysis)
-                .where(PostAnalysis.post_id.in_(post_ids))
-            )
-            return result.scalars().all()
-        except Exception as e:
-            logger.error(f"Error getting post analyses: {e}")
-            raise
-    
-    def _prepare_context(self, posts: List[RedditPost], analyses: List[PostAnalysis]) -> Dict:
+    def _prepare_context(self, posts: List[RedditPost]) -> Dict:
         """Prepare context for AI analysis."""
-        # Create lookup of post_id to analysis
-        analysis_by_post = {
-            analysis.post_id: analysis
-            for analysis in analyses
-        }
-        
         # Prepare context with post content and metadata
         context = {
             "posts": [
@@ -148,9 +125,9 @@ class AIService:
                     "content": post.content,
                     "score": post.score,
                     "num_comments": post.num_comments,
-                    "themes": analysis_by_post.get(post.id).get_matching_themes() if post.id in analysis_by_post else [],
-                    "keywords": analysis_by_post.get(post.id).get_keywords() if post.id in analysis_by_post else [],
-                    "theme_scores": analysis_by_post.get(post.id).get_theme_scores() if post.id in analysis_by_post else {}
+                    "themes": post.matching_themes or [],
+                    "keywords": post.keywords or [],
+                    "theme_scores": post.theme_scores or {}
                 }
                 for post in posts
             ]
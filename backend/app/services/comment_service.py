@@ -68,7 +68,7 @@ async def process_comment_tree(
         is_submitter=comment_data.get("is_submitter", False),
         distinguished=comment_data.get("distinguished"),
         stickied=comment_data.get("stickied", False),
-        awards=comment_data.get("all_awardings", {}),
+        awards=comment_data.get("all_awardings") or None,
         edited=bool(comment_data.get("edited", False)),
         created_at=datetime.fromtimestamp(
             comment_data.get("created_utc", 0),
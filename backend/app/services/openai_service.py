@@ -1,3 +1,5 @@
+import hashlib
+import heapq
 import logging
 from datetime import datetime, timedelta
 from functools import lru_cache
@@ -14,6 +16,25 @@ cache = get_cache()
 
 logger = logging.getLogger(__name__)
 
+# Seconds an OpenAI answer or theme analysis is reused for identical input
+ANALYSIS_CACHE_TTL = 24 * 3600
+
+def _normalize_question(question: str) -> str:
+    """Casefold and collapse whitespace so trivially different questions share a key."""
+    return " ".join(question.casefold().split())
+
+def _analysis_cache_key(
+    kind: str,
+    text: str,
+    posts: List[Dict],
+    comments: Optional[List[Dict]]
+) -> str:
+    """Key an analysis by its prompt text and the ids of the posts and comments it covers."""
+    post_ids = sorted(post.get('id') or 0 for post in posts)
+    comment_ids = sorted(comment.get('id') or 0 for comment in comments or ())
+    digest = hashlib.sha256(f"{text}\0{post_ids}\0{comment_ids}".encode()).hexdigest()
+    return f"{kind}:{digest}"
+
 async def analyze_posts_for_answer(
     question: str,
     posts: List[Dict],
@@ -35,8 +56,9 @@ async def analyze_posts_for_answer(
         Dict containing answer, confidence level, and sources
     """
     try:
-        # Check cache first
-        cache_key = f"qa:{hash(question)}:{hash(str(posts))}"
+        # Check cache first; the same question over the same posts and
+        # comments reuses the earlier answer
+        cache_key = _analysis_cache_key("qa", _normalize_question(question), posts, comments)
         cached_response = await cache.get(cache_key)
         if cached_response:
             return cached_response
@@ -96,8 +118,7 @@ async def analyze_posts_for_answer(
             "analyzed_at": datetime.utcnow().isoformat()
         }
         
-        # Cache the response for 1 hour
-        await cache.set(cache_key, result, expire=3600)
+        await cache.set(cache_key, result, expire=ANALYSIS_CACHE_TTL)
         
         return result
         
@@ -105,6 +126,13 @@ async def analyze_posts_for_answer(
         logger.error(f"Error calling OpenAI API: {str(e)}")
         raise
 
+def _group_comments_by_post(comments: Optional[List[Dict]]) -> Dict[int, List[Dict]]:
+    """Group comments by post id in one pass, keeping their order."""
+    grouped: Dict[int, List[Dict]] = {}
+    for comment in comments or ():
+        grouped.setdefault(comment.get('post_id'), []).append(comment)
+    return grouped
+
 def _prepare_context(
     posts: List[Dict],
     comments: Optional[List[Dict]],
@@ -114,6 +142,8 @@ def _prepare_context(
     context = "Based on the following Reddit content:\n\n"
     current_length = len(context)
     
+    comments_by_post = _group_comments_by_post(comments)
+    
     # Process posts first
     for i, post in enumerate(posts, 1):
         post_text = f"Post {i}:\n"
@@ -123,9 +153,9 @@ def _prepare_context(
         post_text += f"Engagement Score: {post.get('engagement_score', 0):.2f}\n"
         
         # Add post comments if available
-        if comments:
+        if comments_by_post:
             post_comments = _organize_comments_thread(
-                [c for c in comments if c.get('post_id') == post.get('id')]
+                comments_by_post.get(post.get('id'), [])
             )
             if post_comments:
                 post_text += "Discussion Threads:\n"
@@ -227,6 +257,7 @@ def _calculate_confidence(
 def _extract_sources(posts: List[Dict], comments: Optional[List[Dict]] = None) -> List[Dict]:
     """Extract detailed source information."""
     sources = []
+    comments_by_post = _group_comments_by_post(comments)
     for post in posts:
         source = {
             "type": "post",
@@ -240,8 +271,8 @@ def _extract_sources(posts: List[Dict], comments: Optional[List[Dict]] = None) -
         sources.append(source)
         
         # Add top comment if available
-        if comments:
-            post_comments = [c for c in comments if c.get('post_id') == post.get('id')]
+        if comments_by_post:
+            post_comments = comments_by_post.get(post.get('id'))
             if post_comments:
                 best_comment = max(post_comments, key=lambda x: x.get('score', 0))
                 sources.append({
@@ -313,6 +344,12 @@ async def analyze_theme_content(
         Dict containing summary and key insights
     """
     try:
+        # Check cache first
+        cache_key = _analysis_cache_key("theme", category, theme_posts, theme_comments)
+        cached_response = await cache.get(cache_key)
+        if cached_response:
+            return cached_response
+
         # Prepare context focusing on theme-specific content
         context = _prepare_theme_context(theme_posts, theme_comments, category)
         
@@ -337,11 +374,14 @@ async def analyze_theme_content(
             temperature=0.7
         )
         
-        return {
+        result = {
             "summary": response.choices[0].message.content.strip(),
             "category": category,
             "analyzed_at": datetime.utcnow().isoformat()
         }
+        await cache.set(cache_key, result, expire=ANALYSIS_CACHE_TTL)
+        
+        return result
         
     except Exception as e:
         logger.error(f"Error analyzing theme content: {str(e)}")
@@ -367,19 +407,20 @@ def _prepare_theme_context(
     context += f"- Average Engagement: {avg_engagement:.2f}\n\n"
     
     # Add top posts with their best comments
-    sorted_posts = sorted(posts, key=lambda x: x.get('engagement_score', 0), reverse=True)
-    for i, post in enumerate(sorted_posts[:5], 1):
+    top_posts = heapq.nlargest(5, posts, key=lambda x: x.get('engagement_score', 0))
+    comments_by_post = _group_comments_by_post(comments)
+    for i, post in enumerate(top_posts, 1):
         context += f"Top Post {i}:\n"
         context += f"Title: {post.get('title', '')}\n"
         context += f"Content: {post.get('content', '')}\n"
         context += f"Score: {post.get('score', 0)}, Comments: {post.get('num_comments', 0)}\n"
         
         # Add top comments for this post
-        post_comments = [c for c in comments if c.get('post_id') == post.get('id')]
+        post_comments = comments_by_post.get(post.get('id'))
         if post_comments:
-            sorted_comments = sorted(post_comments, key=lambda x: x.get('engagement_score', 0), reverse=True)
+            top_comments = heapq.nlargest(3, post_comments, key=lambda x: x.get('engagement_score', 0))
             context += "Best Comments:\n"
-            for j, comment in enumerate(sorted_comments[:3], 1):
+            for j, comment in enumerate(top_comments, 1):
                 context += f"  {j}. {comment.get('content', '')}\n"
         
         context += "\n"
@@ -4,7 +4,8 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from app.core.collection_config import POST_COLLECTION_CONFIG
+from app.core.collection_config import (POST_COLLECTION_CONFIG,
+                                        POST_DISTRIBUTION)
 from app.models.reddit_post import RedditPost
 from app.services.reddit import RedditService
 from sqlalchemy import select
@@ -47,16 +48,16 @@ class PostCollectionService:
             collected_posts = []
             
             # Collect posts from different sorting methods based on distribution
-            for sort_method, config in POST_COLLECTION_CONFIG['distribution'].items():
+            for sort_method, weight, min_score, time_filters in POST_DISTRIBUTION:
                 if sort_method == 'top':
                     # Handle top posts with multiple timeframes
-                    for tf in config['time_filters']:
+                    for tf in time_filters:
                         posts = await self.reddit_service.get_subreddit_posts(
                             subreddit_name=subreddit_name,
-                            limit=int(distribution[sort_method] * config['weight']),
+                            limit=int(distribution[sort_method] * weight),
                             timeframe=tf,
                             sort=sort_method,
-                            min_score=config['min_score'],
+                            min_score=min_score,
                             progress_callback=progress_callback
                         )
                         collected_posts.extend(self._filter_posts(posts))
@@ -66,7 +67,7 @@ class PostCollectionService:
                         limit=distribution[sort_method],
                         timeframe=timeframe,
                         sort=sort_method,
-                        min_score=config['min_score'],
+                        min_score=min_score,
                         progress_callback=progress_callback
                     )
                     collected_posts.extend(self._filter_posts(posts))
@@ -79,10 +80,10 @@ class PostCollectionService:
     
     def _calculate_distribution_limits(self, total_limit: int) -> Dict[str, int]:
         """Calculate post limits for each sorting method based on weights."""
-        distribution = {}
-        for method, config in POST_COLLECTION_CONFIG['distribution'].items():
-            distribution[method] = int(total_limit * config['weight'])
-        return distribution
+        return {
+            method: int(total_limit * weight)
+            for method, weight, _, _ in POST_DISTRIBUTION
+        }
     
     def _filter_posts(self, posts: List[RedditPost]) -> List[RedditPost]:
         """Apply quality filters to posts."""
@@ -5,6 +5,7 @@
 """
 
 import asyncio
+import heapq
 import logging
 from datetime import datetime, timezone
 from math import ceil
@@ -13,22 +14,42 @@ from typing import Dict, List, Optional, Set, Tuple, Union
 import asyncpraw
 import asyncprawcore
 from app.core.config import get_settings
-from app.core.database import AsyncSessionLocal
+from app.core.database import AsyncSessionLocal, bulk_copy
 from app.core.logger import get_logger
 from app.models import Comment, RedditPost, Subreddit
+from app.models.comment import DISTINGUISHED_KINDS
 from app.schemas.subreddit import KeywordSuggestionResponse
 from asyncpraw.models import Comment as PrawComment
 from asyncpraw.models import Subreddit as AsyncPrawSubreddit
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 from sqlmodel import Session
 
 # Configure logging with more detail
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Comments written per multi-row INSERT
+COMMENT_INSERT_BATCH_SIZE = 500
+
+# Columns refreshed when a collected comment already exists
+COMMENT_UPSERT_COLUMNS = (
+    'post_id', 'content', 'author', 'score', 'depth', 'is_submitter',
+    'distinguished', 'stickied', 'awards', 'edited', 'engagement_score',
+    'created_at', 'reddit_parent_id'
+)
+
+# Columns refreshed when a synced subreddit already exists
+SUBREDDIT_UPSERT_COLUMNS = ('display_name', 'description', 'subscribers', 'active_users')
+
+# New posts at or above this count are written with COPY instead of INSERTs
+COPY_THRESHOLD = 100
+
+# Posts looked up and written per chunk when saving collected posts
+POST_SAVE_CHUNK_SIZE = 10000
+
 # Common topic mappings for popular categories
 TOPIC_MAPPINGS = {
     'dog': [
@@ -65,11 +86,64 @@ TOPIC_MAPPINGS = {
     ],
 }
 
+class _RequestThrottle:
+    """Spaces Reddit API requests made by every RedditService in the process."""
+
+    def __init__(self):
+        # Event loop time at which the next request may start
+        self._next_at = 0.0
+
+    async def wait(self, delay: float) -> None:
+        """Reserve the next request slot, at least delay seconds after the last."""
+        now = asyncio.get_running_loop().time()
+        start_at = max(now, self._next_at)
+        # Reserved before sleeping, so concurrent callers queue up behind it
+        self._next_at = start_at + delay
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+
+# Every RedditService shares the one OAuth client, so they share its rate too;
+# concurrent audience collections each build their own service
+_REQUEST_THROTTLE = _RequestThrottle()
+
+
+def _subreddit_sync_row(subreddit: Union[AsyncPrawSubreddit, Subreddit]) -> Dict:
+    """Build the subreddits row synced for a fetched subreddit."""
+    # Get active users count if available, otherwise estimate it as 1% of subscribers
+    active_users = getattr(subreddit, 'active_user_count', None)
+    if active_users is None:
+        active_users = int(subreddit.subscribers * 0.01)
+    return {
+        'name': subreddit.display_name.lower(),  # Always use lowercase display_name
+        'display_name': subreddit.display_name,
+        'description': subreddit.description,
+        'subscribers': subreddit.subscribers,
+        'active_users': active_users
+    }
+
+
+def _subreddit_upsert(rows: List[Dict]):
+    """INSERT subreddit rows, refreshing the synced columns of existing ones."""
+    stmt = pg_insert(Subreddit).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[Subreddit.name],
+        set_={
+            **{column: stmt.excluded[column] for column in SUBREDDIT_UPSERT_COLUMNS},
+            'updated_at': func.now()
+        }
+    )
+
+
 class RedditService:
     """Service for interacting with Reddit API"""
     
-    def __init__(self, db: AsyncSession):
-        """Initialize the Reddit service with AsyncPRAW client."""
+    def __init__(self, db: Optional[AsyncSession] = None):
+        """Initialize the Reddit service with AsyncPRAW client.
+        
+        The shared app-wide instance is created without a session; methods that
+        need the database take one explicitly (e.g. sync_subreddit_to_db).
+        """
         self.db = db
         try:
             settings = get_settings()
@@ -125,6 +199,9 @@ class RedditService:
             else:
                 raise ValueError(f"Invalid sort method: {sort}")
 
+            # One collection timestamp shared by every post in this call
+            collected_at = datetime.now(timezone.utc)
+
             async def process_submission(submission):
                 """Process a single submission with rate limiting."""
                 # Load full submission data
@@ -142,7 +219,7 @@ class RedditService:
                 # Calculate engagement score
                 engagement_score = self._calculate_engagement_score(submission)
                 
-                # Extract awards
+                # Extract awards; only the total and the most-given award are kept
                 awards = self._extract_awards(submission)
                 
                 # Create post model
@@ -155,14 +232,15 @@ class RedditService:
                     score=submission.score,
                     num_comments=submission.num_comments,
                     created_at=datetime.fromtimestamp(submission.created_utc).replace(tzinfo=timezone.utc),
-                    collected_at=datetime.now(timezone.utc),
+                    collected_at=collected_at,
                     subreddit_name=subreddit_name,
                     is_self=submission.is_self,
                     upvote_ratio=submission.upvote_ratio,
                     is_original_content=getattr(submission, 'is_original_content', False),
                     distinguished=submission.distinguished,
                     stickied=submission.stickied,
-                    awards=awards,
+                    award_count=sum(awards.values()),
+                    top_award=max(awards, key=awards.get) if awards else None,
                     engagement_score=engagement_score,
                     collection_source=sort
                 )
@@ -183,19 +261,23 @@ class RedditService:
             if progress_callback:
                 await progress_callback(len(posts), limit)
             
-            # Save posts to database in batches
-            for i in range(0, len(posts), self.batch_size):
-                batch = posts[i:i + self.batch_size]
+            # Save posts to database in chunks
+            for i in range(0, len(posts), POST_SAVE_CHUNK_SIZE):
+                chunk = posts[i:i + POST_SAVE_CHUNK_SIZE]
                 
-                for post in batch:
-                    # Check if post exists
-                    result = await self.db.execute(
-                        select(RedditPost).where(RedditPost.reddit_id == post.reddit_id)
+                # Look up which posts already exist in one query
+                result = await self.db.execute(
+                    select(RedditPost).where(
+                        RedditPost.reddit_id.in_([post.reddit_id for post in chunk])
                     )
-                    existing_post = result.scalar_one_or_none()
-                    
+                )
+                existing_posts = {post.reddit_id: post for post in result.scalars()}
+                
+                new_posts = {}
+                for post in chunk:
+                    existing_post = existing_posts.get(post.reddit_id)
                     if not existing_post:
-                        self.db.add(post)
+                        new_posts[post.reddit_id] = post
                     else:
                         # Update existing post
                         post_dict = post.dict()
@@ -203,11 +285,26 @@ class RedditService:
                         for key, value in post_dict.items():
                             setattr(existing_post, key, value)
                 
-                # Commit batch
-                await self.db.commit()
+                # COPY large sets of new posts; smaller ones go out as
+                # multi-row INSERTs via insertmanyvalues. Audiences sharing a
+                # subreddit collect concurrently, so a post seen as new here
+                # may already have been written; skip those instead of failing
+                new_rows = [post.dict() for post in new_posts.values()]
+                for row in new_rows:
+                    del row['id']  # Assigned by the database
+                if len(new_rows) >= COPY_THRESHOLD:
+                    await bulk_copy(
+                        self.db, RedditPost.__table__, new_rows, tuple(new_rows[0]),
+                        conflict_columns=('reddit_id',)
+                    )
+                elif new_rows:
+                    await self.db.execute(
+                        pg_insert(RedditPost).on_conflict_do_nothing(index_elements=['reddit_id']),
+                        new_rows
+                    )
                 
-                # Add delay between database batches
-                await asyncio.sleep(self.request_delay)
+                # Commit chunk
+                await self.db.commit()
             
             return posts
             
@@ -218,44 +315,41 @@ class RedditService:
     async def sync_subreddit_to_db(self, subreddit: AsyncPrawSubreddit, session: AsyncSession) -> Subreddit:
         """Sync subreddit information to the database."""
         try:
-            # Check if subreddit exists in database
-            result = await session.execute(
-                select(Subreddit).where(Subreddit.name == subreddit.display_name.lower())
+            # One upsert returning the stored row, instead of SELECT, write and refresh
+            result = await session.scalars(
+                _subreddit_upsert([_subreddit_sync_row(subreddit)]).returning(Subreddit),
+                execution_options={"populate_existing": True}
             )
-            db_subreddit = result.scalar_one_or_none()
-
-            # Get active users count if available, otherwise use a placeholder
-            active_users = getattr(subreddit, 'active_user_count', None)
-            if active_users is None:
-                # If active_user_count is not available, estimate based on subscribers
-                active_users = int(subreddit.subscribers * 0.01)  # Assume 1% of subscribers are active
-
-            if db_subreddit:
-                # Update existing subreddit
-                db_subreddit.display_name = subreddit.display_name
-                db_subreddit.description = subreddit.description
-                db_subreddit.subscribers = subreddit.subscribers
-                db_subreddit.active_users = active_users
-                db_subreddit.updated_at = datetime.utcnow()
-            else:
-                # Create new subreddit
-                db_subreddit = Subreddit(
-                    name=subreddit.display_name.lower(),  # Always use lowercase display_name
-                    display_name=subreddit.display_name,
-                    description=subreddit.description,
-                    subscribers=subreddit.subscribers,
-                    active_users=active_users
-                )
-                session.add(db_subreddit)
-
+            db_subreddit = result.one()
             await session.commit()
-            await session.refresh(db_subreddit)
             return db_subreddit
 
         except Exception as e:
             await session.rollback()
             raise HTTPException(status_code=500, detail=f"Error syncing subreddit to database: {str(e)}")
     
+    async def bulk_sync_subreddits(
+        self,
+        subreddits: List[Union[AsyncPrawSubreddit, Subreddit]],
+        session: AsyncSession
+    ) -> None:
+        """Sync many subreddits to the database with a single upsert."""
+        # One row per name, since a multi-row upsert cannot touch the same row twice
+        rows = {}
+        for subreddit in subreddits:
+            row = _subreddit_sync_row(subreddit)
+            rows[row['name']] = row
+        if not rows:
+            return
+
+        try:
+            # All rows share one statement and one commit
+            await session.execute(_subreddit_upsert(list(rows.values())))
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise HTTPException(status_code=500, detail=f"Error syncing subreddits to database: {str(e)}")
+    
     async def get_trending_subreddits(self, limit: int = 25) -> List[Subreddit]:
         """Get trending subreddits."""
         try:
@@ -333,6 +427,7 @@ class RedditService:
             comments_per_day = posts_per_day * 10  # Placeholder calculation
 
             # Create response
+            now = datetime.now(timezone.utc)
             response = Subreddit(
                 name=subreddit.display_name.lower(),
                 display_name=subreddit.display_name,
@@ -344,8 +439,8 @@ class RedditService:
                 growth_rate=0.0,  # Placeholder
                 relevance_score=0.0,  # Placeholder
                 created_at=datetime.fromtimestamp(subreddit.created_utc, tz=timezone.utc),
-                updated_at=datetime.utcnow(),
-                last_updated=datetime.utcnow()
+                updated_at=now,
+                last_updated=now
             )
 
             logger.info(f"Successfully fetched info for subreddit: {subreddit_name}")
@@ -390,7 +485,8 @@ class RedditService:
                 posts_per_day = None
             
             # Convert created_utc to datetime
-            created_at = datetime.fromtimestamp(subreddit.created_utc) if hasattr(subreddit, 'created_utc') else datetime.utcnow()
+            now = datetime.now(timezone.utc)
+            created_at = datetime.fromtimestamp(subreddit.created_utc) if hasattr(subreddit, 'created_utc') else now
             
             return Subreddit(
                 name=subreddit.display_name.lower(),
@@ -403,8 +499,8 @@ class RedditService:
                 growth_rate=None,
                 relevance_score=0.0,  # Initialize with default score
                 created_at=created_at,
-                updated_at=datetime.utcnow(),
-                last_updated=datetime.utcnow()
+                updated_at=now,
+                last_updated=now
             )
         except Exception as e:
             logger.error(f"Error converting subreddit {subreddit.display_name} to model: {str(e)}")
@@ -430,7 +526,7 @@ class RedditService:
             
             # Filter and sort suggestions
             filtered = [s for s in suggestions if query.lower() in s.lower()]
-            sorted_suggestions = sorted(filtered, key=lambda x: self._calculate_similarity(query, x), reverse=True)
+            top_suggestions = heapq.nlargest(limit, filtered, key=lambda x: self._calculate_similarity(query, x))
             
             # Convert to KeywordSuggestionResponse objects
             return [
@@ -439,7 +535,7 @@ class RedditService:
                     score=self._calculate_similarity(query, s),
                     subreddit_count=None  # We don't have this information yet
                 )
-                for s in sorted_suggestions[:limit]
+                for s in top_suggestions
             ]
         except Exception as e:
             logger.error(f"Error in get_keyword_suggestions: {str(e)}")
@@ -514,8 +610,8 @@ class RedditService:
         max_depth: int = 5,
         min_score: Dict[int, int] = None,
         sort: str = "best"
-    ) -> List[Comment]:
-        """Collect comments for a specific post."""
+    ) -> List[Dict]:
+        """Collect comments for a specific post and upsert them; returns the stored rows."""
         if min_score is None:
             min_score = {
                 0: 1,  # Top-level comments
@@ -562,18 +658,9 @@ class RedditService:
                 logger.error(f"Post {post_id} not found in database")
                 return []
             
-            # Process comments recursively
-            comments = []
-            comment_map = {}  # Map Reddit IDs to Comment objects
-            
-            # First, get all existing comments for this post
-            result = await self.db.execute(
-                select(Comment).where(Comment.post_id == db_post.id)
-            )
-            existing_comments = {c.reddit_id: c for c in result.scalars().all()}
-            
-            # Process comments in batches
-            async def process_comment(comment_data):
+            # Process comments into plain row dicts; rows are written with
+            # multi-row Core inserts instead of one ORM object per comment
+            async def process_comment(comment_data) -> Optional[Dict]:
                 """Process a single comment with rate limiting."""
                 try:
                     # Ensure comment is fully loaded
@@ -606,37 +693,30 @@ class RedditService:
                     # Extract awards
                     awards = self._extract_awards(comment_data)
                     
+                    distinguished = getattr(comment_data, 'distinguished', None)
+                    
+                    # Reddit parent ID if this is a reply (t1_ prefix); top-level comments (t3_) have none
+                    parent_id = getattr(comment_data, 'parent_id', '') or ''
+                    reddit_parent_id = parent_id[3:] if parent_id.startswith('t1_') else None
+                    
                     # Ensure all required fields have valid values
-                    try:
-                        comment = Comment(
-                            reddit_id=comment_data.id,
-                            post_id=db_post.id,  # Ensure post_id is set
-                            content=comment_data.body.strip(),  # We already checked it's not empty above
-                            author=str(comment_data.author) if hasattr(comment_data, 'author') and comment_data.author else '[deleted]',
-                            score=max(0, getattr(comment_data, 'score', 0)),  # Ensure non-negative score
-                            depth=max(0, getattr(comment_data, 'depth', 0)),  # Ensure non-negative depth
-                            is_submitter=bool(getattr(comment_data, 'is_submitter', False)),
-                            distinguished=getattr(comment_data, 'distinguished', None),
-                            stickied=bool(getattr(comment_data, 'stickied', False)),
-                            awards=awards or {},
-                            edited=bool(getattr(comment_data, 'edited', False)),
-                            engagement_score=float(engagement_score or 0.0),  # Ensure valid float
-                            path=[],  # Will be updated after parent IDs are set
-                            created_at=datetime.fromtimestamp(created_utc, tz=timezone.utc),
-                            collected_at=datetime.now(timezone.utc)
-                        )
-                    except Exception as e:
-                        logger.error(f"Error creating comment object for {comment_data.id}: {str(e)}")
-                        return None
-
-                    # Set parent ID if this is a reply
-                    if hasattr(comment_data, 'parent_id'):
-                        if comment_data.parent_id.startswith('t1_'):  # t1_ prefix indicates a comment
-                            comment.reddit_parent_id = comment_data.parent_id[3:]  # Remove t1_ prefix
-                        elif comment_data.parent_id.startswith('t3_'):  # t3_ prefix indicates a post
-                            comment.reddit_parent_id = None  # This is a top-level comment
-
-                    return comment
+                    return {
+                        'reddit_id': comment_data.id,
+                        'post_id': db_post.id,
+                        'content': comment_data.body.strip(),  # We already checked it's not empty above
+                        'author': str(comment_data.author) if comment_data.author else '[deleted]',
+                        'score': max(0, getattr(comment_data, 'score', 0)),  # Ensure non-negative score
+                        'depth': max(0, getattr(comment_data, 'depth', 0)),  # Ensure non-negative depth
+                        'is_submitter': bool(getattr(comment_data, 'is_submitter', False)),
+                        'distinguished': distinguished if distinguished in DISTINGUISHED_KINDS else None,
+                        'stickied': bool(getattr(comment_data, 'stickied', False)),
+                        'awards': awards or None,
+                        'edited': bool(getattr(comment_data, 'edited', False)),
+                        'engagement_score': float(engagement_score or 0.0),  # Ensure valid float
+                        'path': [],
+                        'created_at': datetime.fromtimestamp(created_utc, tz=timezone.utc),
+                        'reddit_parent_id': reddit_parent_id
+                    }
                 except Exception as e:
                     logger.error(f"Error processing comment {comment_data.id}: {str(e)}")
                     return None
@@ -649,66 +729,58 @@ class RedditService:
                 
                 processed = []
                 for comment_data in comments_list:
-                    comment = await process_comment(comment_data)
-                    if comment:
-                        comment.post_id = db_post.id
-                        if comment.reddit_id in existing_comments:
-                            # Update existing comment
-                            existing_comment = existing_comments[comment.reddit_id]
-                            comment_dict = comment.dict(exclude={'id', 'parent', 'replies'})
-                            for key, value in comment_dict.items():
-                                setattr(existing_comment, key, value)
-                            comment_map[comment.reddit_id] = existing_comment
-                            processed.append(existing_comment)
-                        else:
-                            # Add new comment
-                            processed.append(comment)
-                            comment_map[comment.reddit_id] = comment
+                    row = await process_comment(comment_data)
+                    if row:
+                        processed.append(row)
                     
                     # Process replies if they exist
                     if hasattr(comment_data, 'replies') and comment_data.replies:
-                        child_comments = await process_comment_tree(comment_data.replies, depth + 1)
-                        processed.extend(child_comments)
+                        child_rows = await process_comment_tree(comment_data.replies, depth + 1)
+                        processed.extend(child_rows)
                 
                 return processed
 
-            # Process all comments
+            # Process all comments; one row per reddit_id, since a multi-row
+            # upsert cannot touch the same row twice
             comments = await process_comment_tree(submission.comments)
+            comments = list({row['reddit_id']: row for row in comments}.values())
             
-            # Save new comments in batches
-            new_comments = [c for c in comments if c.reddit_id not in existing_comments]
-            if new_comments:
-                for i in range(0, len(new_comments), self.batch_size):
-                    batch = new_comments[i:i + self.batch_size]
-                    self.db.add_all(batch)
-                    await self.db.commit()
-                    
-                    # Refresh all new comments to get their IDs
-                    for comment in batch:
-                        await self.db.refresh(comment)
-                    
-                    # Add delay between batches
-                    await asyncio.sleep(self.request_delay)
+            # Upsert in multi-row batches; existing comments (same reddit_id) are
+            # refreshed in place, keeping their id, parent and path
+            for i in range(0, len(comments), COMMENT_INSERT_BATCH_SIZE):
+                batch = comments[i:i + COMMENT_INSERT_BATCH_SIZE]
+                stmt = pg_insert(Comment).values(batch)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Comment.reddit_id],
+                    set_={
+                        **{column: stmt.excluded[column] for column in COMMENT_UPSERT_COLUMNS},
+                        'collected_at': func.now()
+                    }
+                )
+                await self.db.execute(stmt)
             
-            # Update parent IDs in batches
+            # Link replies to their parents in one statement; the savepoint keeps
+            # a failure here from aborting the inserted comments
             try:
-                for i in range(0, len(comments), self.batch_size):
-                    batch = comments[i:i + self.batch_size]
-                    for comment in batch:
-                        if hasattr(comment, 'reddit_parent_id') and comment.reddit_parent_id:
-                            parent_comment = comment_map.get(comment.reddit_parent_id)
-                            if parent_comment and parent_comment.id:  # Ensure parent has an ID
-                                comment.parent_id = parent_comment.id
-                
-                # Commit parent ID updates
-                await self.db.commit()
-                
-                # Add delay between batches
-                await asyncio.sleep(self.request_delay)
+                async with self.db.begin_nested():
+                    await self.db.execute(
+                        text("""
+                            UPDATE comments AS child
+                            SET parent_id = parent.id
+                            FROM comments AS parent
+                            WHERE child.post_id = :post_id
+                              AND parent.post_id = :post_id
+                              AND child.reddit_parent_id = parent.reddit_id
+                              AND child.parent_id IS DISTINCT FROM parent.id
+                        """),
+                        {"post_id": db_post.id}
+                    )
             except Exception as e:
                 logger.error(f"Error updating parent IDs: {str(e)}")
                 # Continue even if parent ID updates fail
             
+            await self.db.commit()
+            
             logger.info(f"Successfully collected {len(comments)} comments for post {post_id}")
             return comments
             
@@ -761,8 +833,8 @@ class RedditService:
         """
         for attempt in range(self.max_retries):
             try:
-                # Add base delay between requests
-                await asyncio.sleep(self.request_delay)
+                # Space requests across all services sharing the client
+                await _REQUEST_THROTTLE.wait(self.request_delay)
                 return await coroutine
             except asyncprawcore.exceptions.TooManyRequests as e:
                 if attempt == self.max_retries - 1:
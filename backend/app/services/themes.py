@@ -1,26 +1,41 @@
+import heapq
 import logging
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 
 from app.core.config import get_settings
-from app.core.database import AsyncSessionLocal
+from app.core.database import AsyncSessionLocal, driver_connection
 from app.core.logger import get_logger
 from app.models.audience import Audience, AudienceSubreddit
 from app.models.comment import Comment
-from app.models.post_analysis import PostAnalysis
 from app.models.reddit_post import RedditPost
 from app.models.theme import Theme, ThemePost
 from app.models.theme_question import ThemeQuestion
 from app.services.openai_service import analyze_theme_content
 from app.services.reddit import RedditService
-from sqlalchemy import delete
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 from sqlmodel import and_, delete, select, text
 
 logger = logging.getLogger(__name__)
 
+# Deletes an audience's themes with their posts and questions in one
+# statement; the three deletes are independent within the shared snapshot
+DELETE_AUDIENCE_THEMES_SQL = text("""
+    WITH del_theme_posts AS (
+        DELETE FROM themepost
+        WHERE theme_id IN (SELECT id FROM theme WHERE audience_id = :audience_id)
+        RETURNING 1
+    ), del_theme_questions AS (
+        DELETE FROM themequestion
+        WHERE theme_id IN (SELECT id FROM theme WHERE audience_id = :audience_id)
+        RETURNING 1
+    )
+    DELETE FROM theme
+    WHERE audience_id = :audience_id
+""")
+
 class ThemeService:
     def __init__(self, db=None):
         """Initialize the theme service."""
@@ -168,10 +183,11 @@ class ThemeService:
                             existing_post = result.scalar_one_or_none()
                             
                             if not existing_post:
-                                # Add new post
+                                # Add new post; committed now because comment collection
+                                # looks it up from its own session. The id comes back from
+                                # the INSERT and expire_on_commit is off, so no refresh is needed
                                 self.db.add(post)
                                 await self.db.commit()
-                                await self.db.refresh(post)
                                 post_to_use = post
                             else:
                                 # Update existing post
@@ -179,12 +195,13 @@ class ThemeService:
                                 post_dict.pop('id', None)  # Remove ID if present
                                 for key, value in post_dict.items():
                                     setattr(existing_post, key, value)
-                                await self.db.commit()
+                                # Committed with this post's progress update below
                                 post_to_use = existing_post
                                 
                             # Collect comments for all posts
                             try:
-                                comments = await self.reddit_service.collect_post_comments(
+                                # Comments are upserted by the Reddit service itself
+                                await self.reddit_service.collect_post_comments(
                                     post_to_use.reddit_id,
                                     max_depth=5,
                                     min_score={
@@ -194,15 +211,6 @@ class ThemeService:
                                         'default': 1  # All deeper levels
                                     }
                                 )
-                                
-                                # Set post_id for all comments
-                                for comment in comments:
-                                    comment.post_id = post_to_use.id
-                                
-                                # Bulk save comments
-                                if comments:
-                                    self.db.add_all(comments)
-                                    await self.db.commit()
                             except Exception as e:
                                 logger.error(f"Error collecting comments for post {post_to_use.reddit_id}: {str(e)}")
                                 # Continue with next post even if comment collection fails
@@ -257,10 +265,7 @@ class ThemeService:
     async def _analyze_post(self, post: RedditPost) -> None:
         """Analyze a post and store its analysis results."""
         # Check if already analyzed
-        result = await self.db.execute(
-            select(PostAnalysis).where(PostAnalysis.post_id == post.id)
-        )
-        if result.scalar_one_or_none():
+        if post.analyzed_at is not None:
             return
 
         # Find matching themes
@@ -312,14 +317,18 @@ class ThemeService:
             
             theme_scores[theme["category"]] = min(base_score, 1.0)  # Normalize to 0-1
 
-        # Store analysis
-        analysis = PostAnalysis(post_id=post.id)
-        analysis.set_matching_themes([t["category"] for t in matching_themes])
-        analysis.set_theme_scores(theme_scores)
-        analysis.set_keywords(all_keywords)
-        analysis.analyzed_at = datetime.now(timezone.utc)
-        
-        self.db.add(analysis)
+        # Store analysis on the post row; an UPDATE by id also covers posts
+        # built from raw rows that are not attached to this session
+        await self.db.execute(
+            update(RedditPost)
+            .where(RedditPost.id == post.id)
+            .values(
+                matching_themes=[t["category"] for t in matching_themes],
+                theme_scores=theme_scores,
+                keywords=all_keywords,
+                analyzed_at=datetime.now(timezone.utc)
+            )
+        )
         await self.db.commit()
 
     async def analyze_themes(self, audience_id: int) -> List[Theme]:
@@ -330,9 +339,7 @@ class ThemeService:
             if not posts:
                 raise ValueError("No posts found for analysis")
 
-            # Get existing post analyses
             post_ids = [post.id for post in posts]
-            post_analyses = await self._get_post_analyses(post_ids)
             
             # Get comments for all posts
             comments = await self._get_comments_for_posts(post_ids)
@@ -379,14 +386,14 @@ class ThemeService:
             valid_themes = []
             for theme_name, posts in theme_groups.items():
                 if len(posts) >= 3:  # Require at least 3 posts per theme
-                    # Sort posts within theme by engagement and relevance
-                    sorted_posts = sorted(
+                    # Top 10 posts within theme by engagement and relevance
+                    top_posts = heapq.nlargest(
+                        10,
                         posts,
                         key=lambda p: (
                             p.score + sum(c.score for c in comments_by_post.get(p.id, [])),
                             len(comments_by_post.get(p.id, []))
-                        ),
-                        reverse=True
+                        )
                     )
                     
                     # Create theme
@@ -401,14 +408,20 @@ class ThemeService:
                     await self.db.commit()
                     await self.db.refresh(theme)
                     
-                    # Add top posts to theme
-                    for post in sorted_posts[:10]:  # Limit to top 10 posts per theme
-                        theme_post = ThemePost(
-                            theme_id=theme.id,
-                            post_id=post.id,
-                            relevance_score=post.score + sum(c.score for c in comments_by_post.get(post.id, []))
-                        )
-                        self.db.add(theme_post)
+                    # Add top posts to theme with asyncpg's pipelined executemany
+                    connection = await driver_connection(self.db)
+                    await connection.executemany(
+                        "INSERT INTO themepost (theme_id, post_id, relevance_score) "
+                        "VALUES ($1, $2, $3) ON CONFLICT DO NOTHING",
+                        [
+                            (
+                                theme.id,
+                                post.id,
+                                float(post.score + sum(c.score for c in comments_by_post.get(post.id, [])))
+                            )
+                            for post in top_posts
+                        ]
+                    )
                     await self.db.commit()
                     
                     valid_themes.append(theme)
@@ -631,7 +644,10 @@ class ThemeService:
         except Exception as e:
             await self.db.rollback()
             # Log error but don't raise since this is a background task
-            print(f"Error refreshing themes for audience {audience_id}: {str(e)}")
+            logger.exception(
+                f"Error refreshing themes for audience {audience_id}: {str(e)}",
+                extra={"audience_id": audience_id}
+            )
 
     async def _analyze_themes(self, posts: List[Dict], audience_id: int) -> List[Dict]:
         """Analyze themes from a list of posts."""
@@ -818,20 +834,6 @@ class ThemeService:
             logger.error(f"Error analyzing posts: {str(e)}")
             raise 
 
-    async def _get_post_analyses(self, post_ids: List[int]) -> List[PostAnalysis]:
-        """Get post analyses for the given post IDs."""
-        if not self.db:
-            raise ValueError("Database session not initialized")
-
-        try:
-            result = await self.db.execute(
-                select(PostAnalysis).where(PostAnalysis.post_id.in_(post_ids))
-            )
-            return result.scalars().all()
-        except Exception as e:
-            logger.error(f"Error getting post analyses: {str(e)}")
-            return []
-
     async def _get_comments_for_posts(self, post_ids: List[int]) -> List[Comment]:
         """Get comments for the given post IDs."""
         if not self.db:
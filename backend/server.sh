@@ -55,7 +55,7 @@ start_server() {
     
     echo "Starting server from $BACKEND_DIR"
     cd "$BACKEND_DIR" || exit 1
-    uvicorn app.main:app --reload --port $PORT
+    uvicorn app.main:app --reload --port $PORT --loop uvloop --http httptools
 }
 
 # Main script
@@ -19,8 +19,9 @@ from app.models.comment import Comment
 from app.models.theme import Theme
 from app.services.reddit import RedditService
 from app.services.themes import ThemeService
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, raiseload, sessionmaker
 from sqlmodel import SQLModel
 
 # Add the backend directory to the Python path
@@ -60,6 +61,19 @@ TestingSessionLocal = sessionmaker(
     autoflush=False
 )
 
+# Fail on lazy loads: every top-level ORM SELECT in the test process gets
+# raiseload('*'), so touching a relationship that was not eager-loaded with
+# selectinload/joinedload raises instead of quietly issuing an N+1 query
+@event.listens_for(Session, "do_orm_execute")
+def _raise_on_lazy_load(execute_state):
+    """Add raiseload('*') to ORM SELECTs issued by tests and code under test."""
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+    ):
+        execute_state.statement = execute_state.statement.options(raiseload("*"))
+
 # Configure pytest-asyncio using markers
 pytestmark = [
     pytest.mark.asyncio(scope="function"),